@@ -0,0 +1,106 @@
+import math
+
+
+def maximizeUtility(utilities, numColumns):
+    """
+        Solves the assignment problem for a rectangular utility matrix, where utilities[row][column] is the
+        utility of giving the column (a job) to the row (a robot). Returns a list holding the row assigned to
+        each column, chosen so the total utility is as large as possible. Columns that can't get a row because
+        there are more columns than rows are given -1, and rows left over when there are more rows than columns
+        are simply not used.
+
+        Uses the Hungarian algorithm, which runs in O(n^3) for n = max(rows, columns)
+    """
+    numRows = len(utilities)
+    size = max(numRows, numColumns)
+    if size == 0:
+        return []
+
+    # Square cost matrix, 1-indexed to keep the algorithm below readable. Padding cells cost nothing so they
+    # don't change which real assignment is best
+    cost = [[0] * (size + 1) for _ in range(size + 1)]
+    for row in range(numRows):
+        for column in range(numColumns):
+            cost[column + 1][row + 1] = -utilities[row][column]
+
+    # Potentials for columns (u) and rows (v), the column matched to each row, and the path back through the
+    # alternating tree used to augment the matching
+    u = [0] * (size + 1)
+    v = [0] * (size + 1)
+    matchedColumn = [0] * (size + 1)
+    way = [0] * (size + 1)
+    for column in range(1, size + 1):
+        matchedColumn[0] = column
+        current = 0
+        minSlack = [math.inf] * (size + 1)
+        used = [False] * (size + 1)
+        while True:
+            used[current] = True
+            fromColumn = matchedColumn[current]
+            costRow = cost[fromColumn]
+            delta = math.inf
+            nextRow = 0
+            for row in range(1, size + 1):
+                if not used[row]:
+                    slack = costRow[row] - u[fromColumn] - v[row]
+                    if slack < minSlack[row]:
+                        minSlack[row] = slack
+                        way[row] = current
+                    if minSlack[row] < delta:
+                        delta = minSlack[row]
+                        nextRow = row
+            for row in range(size + 1):
+                if used[row]:
+                    u[matchedColumn[row]] += delta
+                    v[row] -= delta
+                else:
+                    minSlack[row] -= delta
+            current = nextRow
+            if matchedColumn[current] == 0:
+                break
+        # Flip the matching along the augmenting path
+        while current:
+            previous = way[current]
+            matchedColumn[current] = matchedColumn[previous]
+            current = previous
+
+    assignment = [-1] * numColumns
+    for row in range(1, size + 1):
+        column = matchedColumn[row] - 1
+        if column < numColumns and row - 1 < numRows:
+            assignment[column] = row - 1
+    return assignment
+
+
+def rankAssignments(utilities, numColumns, rounds):
+    """
+        Finds the best assignment for the utility matrix, then the best one that doesn't give any column a row it
+        was given before, and so on for the given number of rounds. Expects at least as many rows as columns (pad
+        with MIN_UTIL rows if needed). Ties between equally good assignments go to the one that gives lower rows
+        to earlier columns, which is the first one itertools.permutations would list.
+
+        Each round is a single Hungarian solve, so this is O(rounds * n^3) instead of walking every permutation
+    """
+    numRows = len(utilities)
+    size = max(numRows, numColumns)
+    if numColumns == 0:
+        return [[] for _ in range(rounds)]
+
+    # Scale the utilities up and subtract the rank of the assignment in permutation order, so the tie-break can
+    # never outweigh a real difference in utility. Python ints keep this exact however large it gets
+    scale = size ** numColumns
+    places = [size ** (numColumns - 1 - column) for column in range(numColumns)]
+    weights = [[utilities[row][column] * scale - row * places[column] for column in range(numColumns)]
+               for row in range(numRows)]
+    largest = max(abs(weight) for weightRow in weights for weight in weightRow)
+    # Low enough that any assignment using a forbidden pair is worse than every assignment that doesn't
+    forbidden = -(2 * size * largest + 1)
+
+    ranked = []
+    for _ in range(rounds):
+        best = maximizeUtility(weights, numColumns)
+        ranked.append(best)
+        for column, row in enumerate(best):
+            if row >= 0:
+                weights[row][column] = forbidden
+    return ranked
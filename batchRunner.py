@@ -0,0 +1,78 @@
+import argparse
+import csv
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+import mapRegistry
+import warehouseSimulator
+
+
+COLUMNS = ["ticks", "powerConsumed", "distanceTraveled", "jobsCompleted", "timeCharging", "conflicts", "utilityLost",
+           "waitTicks", "replans", "congestion"]
+KEYS = ["mode", "warehouse", "seed", "iteration"]
+
+
+def runTask(task):
+    """
+        Runs one headless simulation for a (mode, warehouse, seed, iteration) combination. The random module is
+        seeded from the seed and iteration, so every combination gets its own stream no matter which worker
+        process picks it up or in what order
+    """
+    mode, warehouse, seed, iteration, engine, cacheDir = task
+    random.seed(f"{seed}:{iteration}")
+    simulation = warehouseSimulator.WarehouseSimulator(0, mode, False, False, 1, mapRegistry.loadMap(warehouse),
+                                                       engine=engine, cacheDir=cacheDir)
+    simulation.run(report=False)
+    return simulation.stats.getTotals()
+
+
+def printTable(rows, keys):
+    """Prints the rows as a table, one column per key"""
+    widths = [max(len(key), *(len(f"{row[key]}") for row in rows)) for key in keys]
+    print("  ".join(key.rjust(width) for key, width in zip(keys, widths)))
+    for row in rows:
+        print("  ".join(f"{row[key]}".rjust(width) for key, width in zip(keys, widths)))
+
+
+def writeResults(rows, path):
+    """Writes the rows to a CSV file, one column per key and totals column"""
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=KEYS + COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    """Runs every combination of modes, warehouses, seeds and iterations across a pool of worker processes"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-m", "--modes", type=str, nargs='+', choices=['a', 'b', 'c', 'd', 'e', 'f'],
+                        default=['a', 'b', 'c', 'd', 'e', 'f'], help="Simulation modes to run")
+    parser.add_argument("-w", "--warehouses", type=str, nargs='+', default=[str(number) for number in range(len(mapRegistry.MAPS))],
+                        help="Warehouses to run the modes on, by number, name or path like main.py -w")
+    parser.add_argument("-s", "--seeds", type=int, nargs='+', default=[1337], help="Seeds to run each combination with")
+    parser.add_argument("-i", "--iterations", type=int, default=1, help="Number of times to run each combination")
+    parser.add_argument("-e", "--engine", type=str, choices=['object', 'vector'], default='object',
+                        help="Simulation core to use")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes, defaults to one per core")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Also write every result to this CSV file")
+    parser.add_argument("-c", "--cache-dir", type=str, default=None,
+                        help="Directory of distance fields and routes shared by the workers and kept between runs")
+    args = parser.parse_args()
+
+    tasks = list(itertools.product(args.modes, args.warehouses, args.seeds, range(args.iterations), [args.engine],
+                                  [args.cache_dir]))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(runTask, tasks))
+
+    rows = []
+    for (mode, warehouse, seed, iteration, _, _), totals in zip(tasks, results):
+        rows.append({"mode": mode, "warehouse": warehouse, "seed": seed, "iteration": iteration, **totals})
+    printTable(rows, KEYS + COLUMNS)
+
+    if args.output:
+        writeResults(rows, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+from collections import deque
+from pathEngine import PathEngine, Path
+
+
+class BreadthFirstEngine(PathEngine):
+    """
+        PathEngine that ignores cell weights and finds the path with the fewest steps using a breadth first
+        search. Handy as a baseline for the other planners, every node closer than the end gets expanded
+    """
+    WEIGHTED = False
+
+    def findPath(self, startX, startY, endX, endY):
+        """
+            Returns the path with the fewest steps from (startX, startY) to (endX, endY) as a Path including both
+            ends, or an empty Path if the end can't be reached
+        """
+        grid = self.grid
+        width = grid.width
+        start = startY * width + startX
+        end = endY * width + endX
+        self.searches += 1
+
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            self.expanded += 1
+            if node == end:
+                return self.backtrace(parents, end)
+            for neighbor in grid.neighbors(node):
+                if neighbor not in parents:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
+
+        return Path(width=width)
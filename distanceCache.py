@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+
+class DistanceCache:
+    """
+        Answers path length questions between any two cells for all the robots. Lengths to charging and job
+        stations come straight from the DistanceField; anything else is searched for once with the PathEngine, all
+        the targets asked about together in one search, and remembered by cell, so it stays valid across robots,
+        ticks and iterations since the warehouse never changes. The least recently used entries are dropped once
+        the cache holds maxSize of them
+    """
+
+    def __init__(self, distanceField, pathEngine, maxSize=100000):
+        self.distanceField = distanceField
+        self.pathEngine = pathEngine
+        self.maxSize = maxSize
+        self.size = pathEngine.grid.width * pathEngine.grid.height
+        self.width = pathEngine.grid.width
+        self.lengths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def pathLength(self, fromX, fromY, toX, toY):
+        """Returns the number of cells in the path from (fromX, fromY) to (toX, toY), or 0 if there is none"""
+        if self.distanceField.hasTarget(toX, toY):
+            return self.distanceField.pathLength(fromX, fromY, toX, toY)
+        return self.pathLengths(fromX, fromY, [(toX, toY)])[0]
+
+    def pathLengths(self, fromX, fromY, targets):
+        """
+            Returns the path length from (fromX, fromY) to each of the (x, y) targets. Whatever isn't a station or
+            already cached is found with one search from (fromX, fromY) for all of them, rather than one each
+        """
+        lengths = []
+        missing = []
+        start = (fromY * self.width + fromX) * self.size
+        for toX, toY in targets:
+            if self.distanceField.hasTarget(toX, toY):
+                lengths.append(self.distanceField.pathLength(fromX, fromY, toX, toY))
+                continue
+            key = start + toY * self.width + toX
+            length = self.lengths.get(key)
+            if length is not None:
+                self.hits += 1
+                self.lengths.move_to_end(key)
+            else:
+                self.misses += 1
+                missing.append(len(lengths))
+            lengths.append(length)
+
+        if missing:
+            found = self.pathEngine.findLengths(fromX, fromY, [targets[i] for i in missing])
+            for i, length in zip(missing, found):
+                lengths[i] = length
+                self.lengths[start + targets[i][1] * self.width + targets[i][0]] = length
+            while len(self.lengths) > self.maxSize:
+                self.lengths.popitem(last=False)
+        return lengths
+
+    def getHitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def printReport(self):
+        print(f"    Distance Cache: {self.hits} hits, {self.misses} misses ({self.getHitRate():.0%} hit rate), "
+              f"{len(self.lengths)} entries")
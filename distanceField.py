@@ -0,0 +1,129 @@
+import heapq
+from array import array
+import constants
+from pathEngine import PathEngine
+
+
+class DistanceField:
+    """
+        Path lengths from every cell in the warehouse to each charging station and job station. The warehouse
+        layout never changes, so one flood per station is enough to answer every "how far is it to this
+        station" question robots ask during the simulation in O(1).
+
+        Floods are only run as far as they need to go. A station's flood starts the first time a length to it
+        is asked for and stops as soon as that cell is settled, keeping its heap so the next question picks up
+        where it left off. Stations nobody asks about cost nothing, and on big maps most floods never get far
+        past the cells robots actually stand on.
+
+        Lengths follow the same convention as the paths returned by the finder: the number of cells in the
+        path including the start cell, or 0 when the station can't be reached. Cell values are used as
+        movement weights just like the weighted A* robots use, and where equally cheap paths differ in
+        length the one A* finds counts, so lengths always match PathEngine.findPath.
+    """
+
+    UNREACHABLE = 0
+    # Cheapest paths from the cell come in more than one length, which one A* takes isn't known yet
+    TIED = -1
+
+    def __init__(self, grid, fields=None):
+        self.grid = grid
+        self.width = grid.width
+        self.stations = set(self.targets(grid))
+        # Settles ties between equally cheap paths of different lengths
+        self.pathEngine = PathEngine(grid)
+        # Lengths to each station flooded so far, cells the flood hasn't reached yet are 0. Fields can be handed
+        # over already built, e.g. opened from a MapCache
+        self.fields = fields if fields is not None else {}
+        # Costs, fewest and most cells and heap of every flood that hasn't finished yet, by station
+        self.floods = {}
+
+    @staticmethod
+    def targets(grid):
+        """Returns the (x, y) of every charging and job station, in the order their fields are built"""
+        return [grid.position(index) for index, cell in enumerate(grid.cells)
+                if cell in (constants.CHARGING_STATION, constants.JOB_STATION)]
+
+    def hasTarget(self, x, y):
+        """Returns true if lengths to the cell at (x, y) are kept here"""
+        return (x, y) in self.stations
+
+    def pathLength(self, fromX, fromY, toX, toY):
+        """Returns the length of the path from (fromX, fromY) to the station at (toX, toY)"""
+        index = fromY * self.width + fromX
+        field = self.fields.get((toX, toY))
+        if field is None:
+            # A robot sitting on its own charger asks this every tick, no need to start a flood for it
+            if fromX == toX and fromY == toY:
+                return 1
+            field = self.start(toX, toY)
+        length = field[index]
+        if length == self.UNREACHABLE and (toX, toY) in self.floods:
+            length = self.flood(toX, toY, index)
+        if length == self.TIED:
+            length = len(self.pathEngine.findPath(fromX, fromY, toX, toY))
+            field[index] = length
+        return length
+
+    def field(self, x, y):
+        """Returns the lengths from every cell to the station at (x, y), finishing its flood first"""
+        if (x, y) not in self.fields:
+            self.start(x, y)
+        if (x, y) in self.floods:
+            self.flood(x, y)
+        return self.fields[(x, y)]
+
+    def resolveTies(self):
+        """Finishes every flood and fills in every TIED length, e.g. before the fields are saved to be shared"""
+        for toX, toY in self.targets(self.grid):
+            field = self.field(toX, toY)
+            for index in [index for index, length in enumerate(field) if length == self.TIED]:
+                self.pathLength(index % self.width, index // self.width, toX, toY)
+
+    def start(self, targetX, targetY):
+        """Sets up the flood from the target cell, returns its still empty field"""
+        size = len(self.grid.cells)
+        target = self.grid.index(targetX, targetY)
+        costs = array('i', [-1]) * size
+        costs[target] = 0
+        field = array('i', [self.UNREACHABLE]) * size
+        self.fields[(targetX, targetY)] = field
+        self.floods[(targetX, targetY)] = (costs, array('i', [0]) * size, array('i', [0]) * size, [(0, target)])
+        return field
+
+    def flood(self, targetX, targetY, until=None):
+        """
+            Carries on the reverse Dijkstra from the target cell until the cell at index until is settled, or
+            until every cell is if until is None, and returns the length for until. The cost of stepping onto a
+            cell is its value in the warehouse, so walking backwards from a cell costs the weight of the cell we
+            came from.
+
+            Every cheapest path has the same cost but not always the same number of cells, so the fewest and
+            most cells over the cheapest paths are tracked too. Where they agree any cheapest path has that
+            length, including the one A* picks; where they don't the cell is marked TIED, and the length of the
+            path A* finds is filled in the first time it is asked for
+        """
+        grid = self.grid
+        cells = grid.cells
+        lengths = self.fields[(targetX, targetY)]
+        costs, fewest, most, heap = self.floods[(targetX, targetY)]
+        while heap:
+            cost, index = heapq.heappop(heap)
+            if cost != costs[index]:
+                continue
+            # Every cell a cheapest path can go on to is cheaper, so its steps were all counted before this pop
+            lengths[index] = fewest[index] + 1 if fewest[index] == most[index] else self.TIED
+            stepCost = cost + cells[index]
+            for neighbor in grid.neighbors(index):
+                if costs[neighbor] < 0 or stepCost < costs[neighbor]:
+                    costs[neighbor] = stepCost
+                    fewest[neighbor] = fewest[index] + 1
+                    most[neighbor] = most[index] + 1
+                    heapq.heappush(heap, (stepCost, neighbor))
+                elif stepCost == costs[neighbor]:
+                    fewest[neighbor] = min(fewest[neighbor], fewest[index] + 1)
+                    most[neighbor] = max(most[neighbor], most[index] + 1)
+            if index == until:
+                return lengths[index]
+        # Everything reachable is settled, the rest of the flood's bookkeeping isn't needed any more
+        del self.floods[(targetX, targetY)]
+        return None if until is None else lengths[until]
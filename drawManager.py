@@ -7,7 +7,9 @@ import constants
 class DrawManager:
     """
       Manager for drawing everything to the screen. This includes the background,
-      all objects in the warehouse, and finally the grid overtop
+      all objects in the warehouse, and finally the grid overtop. The warehouse layout
+      never changes, so the floor, walls, stations and grid are drawn once onto a
+      background surface and only the cells robots were on or moved to are redrawn
     """
     def __init__(self, screen, windowWidth, windowHeight, cellSize, warehouse):
         spritesheet           = pygame.image.load("resources/spritesheet.png").convert_alpha()
@@ -23,40 +25,60 @@ class DrawManager:
         self.windowHeight = windowHeight
         self.cellSize = cellSize
         self.warehouse = warehouse
+        self.background = pygame.Surface((windowWidth, windowHeight)).convert()
+        self.drawBackground()
+        # Cells drawn over last frame, None until the whole background has been shown once
+        self.robotRects = None
 
     def update(self, robots):
-        """Handles drawing everything on the screen"""
-        # self.screen.fill(constants.WHITE)
-        self.drawObjects(robots)
-        self.drawGrid() # comment this out to remove grid lines
+        """
+            Handles drawing everything on the screen. Returns the rectangles that changed, to be
+            passed on to pygame.display.update
+        """
+        if self.robotRects is None:
+            self.screen.blit(self.background, (0, 0))
+            dirtyRects = [self.screen.get_rect()]
+        else:
+            # Put the background back wherever a robot was last frame
+            for rect in self.robotRects:
+                self.screen.blit(self.background, rect, rect)
+            dirtyRects = self.robotRects
 
-    def drawGrid(self):
-        """Draws the grid over the warehouse. Shamelessly "borrowed" from program 1"""
-        for x in range(0, self.windowWidth, self.cellSize):  # draw vertical lines
-            pygame.draw.line(self.screen, constants.BLACK, (x, 0), (x, self.windowHeight))
-        for y in range(0, self.windowHeight, self.cellSize):  # draw horizontal lines
-            pygame.draw.line(self.screen, constants.BLACK, (0, y), (self.windowWidth, y))
+        self.robotRects = self.drawRobots(robots)
+        return dirtyRects + self.robotRects
 
-    def drawObjects(self, robots):
-        """Draws all the objects in the warehouse"""
+    def drawBackground(self):
+        """Draws the warehouse layout and the grid onto the background surface"""
         for y in range(len(self.warehouse)):
             for x in range(len(self.warehouse[0])):
                 if self.warehouse[y][x] == constants.WALL:
-                    self.screen.blit(self.WALL, (x * self.cellSize, y * self.cellSize))
+                    self.background.blit(self.WALL, (x * self.cellSize, y * self.cellSize))
 
                 elif self.warehouse[y][x] == constants.CHARGING_STATION:
-                    self.screen.blit(self.FLOOR, (x * self.cellSize, y * self.cellSize))
-                    self.screen.blit(self.CHARGING_STATION, (x * self.cellSize, y * self.cellSize))
+                    self.background.blit(self.FLOOR, (x * self.cellSize, y * self.cellSize))
+                    self.background.blit(self.CHARGING_STATION, (x * self.cellSize, y * self.cellSize))
 
                 elif self.warehouse[y][x] == constants.JOB_STATION:
-                    self.screen.blit(self.FLOOR, (x * self.cellSize, y * self.cellSize))
-                    self.screen.blit(self.JOB_STATION, (x * self.cellSize, y * self.cellSize))
+                    self.background.blit(self.FLOOR, (x * self.cellSize, y * self.cellSize))
+                    self.background.blit(self.JOB_STATION, (x * self.cellSize, y * self.cellSize))
 
                 else:
-                    self.screen.blit(self.FLOOR, (x * self.cellSize, y * self.cellSize))
+                    self.background.blit(self.FLOOR, (x * self.cellSize, y * self.cellSize))
 
+        self.drawGrid(self.background) # comment this out to remove grid lines
+
+    def drawGrid(self, surface):
+        """Draws the grid over the warehouse. Shamelessly "borrowed" from program 1"""
+        for x in range(0, self.windowWidth, self.cellSize):  # draw vertical lines
+            pygame.draw.line(surface, constants.BLACK, (x, 0), (x, self.windowHeight))
+        for y in range(0, self.windowHeight, self.cellSize):  # draw horizontal lines
+            pygame.draw.line(surface, constants.BLACK, (0, y), (self.windowWidth, y))
+
+    def drawRobots(self, robots):
+        """Draws all the robots in the warehouse and returns the cells they cover"""
+        rects = []
         for robot in robots:
-            robotRect = (robot.x * self.cellSize, robot.y * self.cellSize)
+            robotRect = pygame.Rect(robot.x * self.cellSize, robot.y * self.cellSize, self.cellSize, self.cellSize)
             self.screen.blit(self.FLOOR, robotRect)
 
             if not robot.needCharge:
@@ -73,3 +95,9 @@ class DrawManager:
 
             else:
                 self.screen.blit(self.ROBOT_LOW, robotRect)
+
+            # The grid lines on the top and left edges of the cell belong to it
+            pygame.draw.line(self.screen, constants.BLACK, robotRect.topleft, (robotRect.right - 1, robotRect.top))
+            pygame.draw.line(self.screen, constants.BLACK, robotRect.topleft, (robotRect.left, robotRect.bottom - 1))
+            rects.append(robotRect)
+        return rects
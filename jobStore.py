@@ -0,0 +1,64 @@
+import heapq
+from dataclasses import dataclass
+
+
+@dataclass
+class Job:
+    startX: int
+    startY: int
+    endX: int
+    endY: int
+    activationTime: int
+    assigned: bool
+    fake: bool
+    id: int = -1
+
+    def __hash__(self):
+        return hash((self.id, self.fake))
+
+
+class JobStore:
+    """
+        Holds every job in the simulation. Jobs get a stable id when they are added and wait in a queue ordered by
+        activation time until they become active, at which point they move into an index of active jobs that
+        haven't been assigned yet. Picking the jobs that are up for grabs each tick only touches newly activated
+        jobs and the ones still waiting for a robot, not every job ever created
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.pending = []
+        self.available = {}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, startX, startY, endX, endY, activationTime):
+        job = Job(startX, startY, endX, endY, activationTime, False, False, len(self.jobs))
+        self.jobs.append(job)
+        heapq.heappush(self.pending, (activationTime, job.id))
+        return job
+
+    def getAvailable(self, tick):
+        """Returns the jobs that are active by the given tick and not assigned to a robot, oldest first"""
+        while self.pending and self.pending[0][0] <= tick:
+            _, jobId = heapq.heappop(self.pending)
+            self.available[jobId] = self.jobs[jobId]
+        # Jobs are marked as assigned directly, so drop those lazily
+        for jobId in [jobId for jobId, job in self.available.items() if job.assigned]:
+            del self.available[jobId]
+        return list(self.available.values())
+
+    def getNextActivationTime(self):
+        """Returns the tick the next pending job activates at, or None if every job is already active"""
+        return self.pending[0][0] if self.pending else None
+
+    def hasPending(self):
+        """Returns true if some jobs haven't been activated yet"""
+        return len(self.pending) > 0
+
+    def release(self, job):
+        """Hands a job back so another robot can pick it up. It goes to the back of the line"""
+        job.assigned = False
+        self.available.pop(job.id, None)
+        self.available[job.id] = job
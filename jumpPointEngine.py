@@ -0,0 +1,108 @@
+import heapq
+from array import array
+from pathEngine import PathEngine, Path
+
+
+class JumpPointEngine(PathEngine):
+    """
+        PathEngine running Jump Point Search for 4-connected grids. It ignores cell weights and finds the path with
+        the fewest steps, like BreadthFirstEngine, but skips over the many equally short paths an open floor allows
+        by only putting jump points on the open list.
+
+        Paths are searched in a canonical form that moves sideways first and turns up or down as late as it can.
+        A sideways scan can turn up or down at any cell, so it stops wherever a vertical scan from it would find
+        something; a vertical scan only stops at the end or where a wall behind it opens up to the side (a forced
+        neighbour). Expanded nodes only count jump points, the cells scanned between them aren't counted
+    """
+    WEIGHTED = False
+    START_DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+    def findPath(self, startX, startY, endX, endY):
+        """
+            Returns the path with the fewest steps from (startX, startY) to (endX, endY) as a Path including both
+            ends, or an empty Path if the end can't be reached
+        """
+        walkable = self.grid.walkable
+        self.searches += 1
+
+        def forced(x, y, dx, dy):
+            """True if the cell to the dx side of (x, y) can only be reached through it when moving dy"""
+            return walkable(x + dx, y) and not walkable(x + dx, y - dy)
+
+        def jumpVertical(x, y, dy):
+            while True:
+                y += dy
+                if not walkable(x, y):
+                    return None
+                if (x == endX and y == endY) or forced(x, y, 1, dy) or forced(x, y, -1, dy):
+                    return x, y
+
+        def jumpHorizontal(x, y, dx):
+            while True:
+                x += dx
+                if not walkable(x, y):
+                    return None
+                if (x == endX and y == endY) or jumpVertical(x, y, 1) or jumpVertical(x, y, -1):
+                    return x, y
+
+        start = (startX, startY)
+        costs = {start: 0}
+        parents = {start: None}
+        directions = {start: None}
+        closed = set()
+        pushed = 0
+        heap = [(0, pushed, start)]
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            self.expanded += 1
+            x, y = node
+            if x == endX and y == endY:
+                return self.backtrace(parents, node)
+
+            direction = directions[node]
+            if direction is None:
+                successors = self.START_DIRECTIONS
+            elif direction[0]:
+                successors = [direction, (0, -1), (0, 1)]
+            else:
+                dy = direction[1]
+                successors = [direction] + [(dx, 0) for dx in (1, -1) if forced(x, y, dx, dy)]
+
+            for dx, dy in successors:
+                jumpPoint = jumpHorizontal(x, y, dx) if dx else jumpVertical(x, y, dy)
+                if jumpPoint is None or jumpPoint in closed:
+                    continue
+                newCost = costs[node] + abs(jumpPoint[0] - x) + abs(jumpPoint[1] - y)
+                if jumpPoint not in costs or newCost < costs[jumpPoint]:
+                    costs[jumpPoint] = newCost
+                    parents[jumpPoint] = node
+                    directions[jumpPoint] = (dx, dy)
+                    pushed += 1
+                    estimate = newCost + abs(jumpPoint[0] - endX) + abs(jumpPoint[1] - endY)
+                    heapq.heappush(heap, (estimate, pushed, jumpPoint))
+
+        return Path(width=self.grid.width)
+
+    def backtrace(self, parents, end):
+        """Fills in the cells between the jump points"""
+        width = self.grid.width
+        jumpPoints = []
+        node = end
+        while node is not None:
+            jumpPoints.append(node)
+            node = parents[node]
+        jumpPoints.reverse()
+
+        cells = array('i', [jumpPoints[0][1] * width + jumpPoints[0][0]])
+        for (x1, y1), (x2, y2) in zip(jumpPoints, jumpPoints[1:]):
+            stepX = (x2 > x1) - (x2 < x1)
+            stepY = (y2 > y1) - (y2 < y1)
+            x, y = x1, y1
+            while (x, y) != (x2, y2):
+                x += stepX
+                y += stepY
+                cells.append(y * width + x)
+        return Path(cells, width)
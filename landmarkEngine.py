@@ -0,0 +1,102 @@
+import heapq
+from array import array
+import constants
+from pathEngine import PathEngine
+
+
+class LandmarkEngine(PathEngine):
+    """
+        PathEngine that guides A* with landmarks (ALT) instead of the manhattan distance. A handful of landmark
+        cells spread around the warehouse get the cost from them to every other cell worked out up front, and the
+        triangle inequality turns those into a lower bound between any two cells that follows the walls and
+        aisles. Searches find paths just as cheap as plain A*, but on big maps with long aisles they expand far
+        fewer nodes getting there.
+
+        Costs aren't symmetric (stepping onto a cell costs its weight), but the cost from a to b and from b to a
+        over the same cells only differs by the weights of the two ends, so one flood per landmark covers both
+        directions
+    """
+
+    UNREACHABLE = -1
+    # Landmarks consulted per search
+    ACTIVE_LANDMARKS = 3
+
+    def __init__(self, grid, numLandmarks=8):
+        super().__init__(grid)
+        self.landmarks = []
+        self.costs = []
+        self.chooseLandmarks(numLandmarks)
+
+    def chooseLandmarks(self, numLandmarks):
+        """
+            Picks landmarks one at a time, each as far as possible from the ones before it, starting with the cell
+            furthest from the first walkable cell. Far apart landmarks on the edges of the map give the tightest
+            bounds
+        """
+        cells = self.grid.cells
+        first = next((index for index, cell in enumerate(cells) if cell != constants.WALL), None)
+        if first is None:
+            return
+        # Cost from the closest landmark so far to every cell, walls and unreachable cells are never picked
+        nearest = self.flood(first)
+        for _ in range(numLandmarks):
+            landmark = max(range(len(cells)), key=nearest.__getitem__)
+            if self.landmarks and nearest[landmark] <= 0:
+                break
+            costs = self.flood(landmark)
+            self.landmarks.append(landmark)
+            self.costs.append(costs)
+            nearest = costs if len(self.landmarks) == 1 else array('i', map(min, nearest, costs))
+
+    def flood(self, source):
+        """Returns the cost of the cheapest path from the source cell to every cell, or UNREACHABLE"""
+        grid = self.grid
+        cells = grid.cells
+        costs = array('i', [self.UNREACHABLE]) * len(cells)
+        costs[source] = 0
+        heap = [(0, source)]
+        while heap:
+            cost, index = heapq.heappop(heap)
+            if cost > costs[index]:
+                continue
+            for neighbor in grid.neighbors(index):
+                newCost = cost + cells[neighbor]
+                if costs[neighbor] == self.UNREACHABLE or newCost < costs[neighbor]:
+                    costs[neighbor] = newCost
+                    heapq.heappush(heap, (newCost, neighbor))
+        return costs
+
+    def heuristic(self, startX, startY, endX, endY):
+        """
+            Lower bound on the cost from a cell to (endX, endY) using the landmarks, never below the plain manhattan
+            bound. For landmark L, cost(L, end) <= cost(L, n) + cost(n, end), and cost(n, L) - cost(end, L) is also a
+            bound, where cost(n, L) = cost(L, n) + weight(L) - weight(n). Only the few landmarks that give the best
+            bound at the start are used, checking all of them for every node costs more than it saves
+        """
+        width = self.grid.width
+        cells = self.grid.cells
+        minWeight = self.grid.minWeight
+        start = startY * width + startX
+        end = endY * width + endX
+        endWeight = cells[end]
+
+        def landmarkBound(costs, node):
+            toEnd, toNode = costs[end], costs[node]
+            if toEnd == self.UNREACHABLE or toNode == self.UNREACHABLE:
+                return 0
+            return max(toEnd - toNode, toNode - toEnd - cells[node] + endWeight)
+
+        active = sorted(self.costs, key=lambda costs: landmarkBound(costs, start), reverse=True)[:self.ACTIVE_LANDMARKS]
+        active = [(costs, costs[end]) for costs in active if costs[end] != self.UNREACHABLE]
+
+        def estimate(node):
+            bound = (abs(node % width - endX) + abs(node // width - endY)) * minWeight
+            nodeWeight = cells[node]
+            for costs, toEnd in active:
+                toNode = costs[node]
+                if toNode == self.UNREACHABLE:
+                    continue
+                bound = max(bound, toEnd - toNode, toNode - toEnd - nodeWeight + endWeight)
+            return bound
+
+        return estimate
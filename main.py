@@ -1,7 +1,8 @@
 import argparse
+import os
 import warehouseSimulator
 import random
-import constants
+import mapRegistry
 
 def main():
     """Main entrypoint for the simulation"""
@@ -12,12 +13,36 @@ def main():
     parser.add_argument("-ng", "--no-gui", action="store_false", default=True, help="Whether to run with the GUI or not, default is true")
     parser.add_argument("-v", "--verbose", action="store_true", default=False, help="Prints extra info during simulation")
     parser.add_argument("-i", "--iterations", type=int, default=1, help="Number of times to run the simulation")
-    parser.add_argument("-w", "--warehouse", type=int, default=0, help="Integer for which warehouse to run the simulator with (0-2)")
+    parser.add_argument("-w", "--warehouse", type=str, default="0", help="Warehouse to run the simulator with, a number (0-2) or name of a bundled one or the path of a .csv or .wmap map")
+    parser.add_argument("-nv", "--num-votes", type=int, default=3, help="How many ranked preferences each robot votes with in modes c and d")
+    parser.add_argument("-e", "--engine", type=str, choices=['object', 'vector'], default='object', help="Simulation core. object-Robots update one at a time, vector-All robots update at once with NumPy")
+    parser.add_argument("-ff", "--fast-forward", action="store_true", default=False, help="Skip over ticks where nothing but batteries and positions change, only with -ng")
+    parser.add_argument("-r", "--reserve-paths", action="store_true", default=False, help="Robots plan around each other's paths instead of driving through each other, only with the object engine")
+    parser.add_argument("-p", "--planner", type=str, choices=list(warehouseSimulator.PLANNERS), default='astar', help="Path planner robots use. astar-A* over cell weights, landmark-A* with landmark bounds, bfs-Breadth first fewest steps, jps-Jump point search fewest steps")
+    parser.add_argument("-pr", "--profile", action="store_true", default=False, help="Time each phase of every tick and print a summary at the end")
+    parser.add_argument("-po", "--profile-output", type=str, default=None, help="Also record the run with cProfile and write the stats to this file, implies -pr")
+    parser.add_argument("-t", "--telemetry", type=str, default=None, help="Directory to stream per-tick robot state to as .npy files")
+    parser.add_argument("-ss", "--save-snapshot", type=str, default=None, help="Save the state of the simulation to this file when it reaches the tick given with -st")
+    parser.add_argument("-st", "--snapshot-tick", type=int, default=100, help="Tick to save the snapshot at with -ss")
+    parser.add_argument("-ls", "--load-snapshot", type=str, default=None, help="Carry on from a snapshot saved with -ss instead of starting fresh, in whichever mode and engine is picked")
+    parser.add_argument("-c", "--cache-dir", type=str, default=None, help="Directory to keep distance fields and routes in between runs, so later runs on the same warehouse skip working them out")
     args = parser.parse_args()
+    if args.reserve_paths and (args.engine == 'vector' or args.fast_forward):
+        parser.error("-r/--reserve-paths only works with the object engine and without -ff/--fast-forward")
+    if args.num_votes < 2:
+        parser.error("-nv/--num-votes needs to be at least 2, the last preference is worth nothing")
+    if args.warehouse.isdigit() and int(args.warehouse) >= len(mapRegistry.MAPS) and not os.path.exists(args.warehouse):
+        parser.error(f"-w/--warehouse {args.warehouse} isn't a bundled warehouse, pick 0-{len(mapRegistry.MAPS) - 1} or give the path of a map")
+    try:
+        warehouse = mapRegistry.loadMap(args.warehouse)
+    except (OSError, ValueError) as error:
+        parser.error(f"-w/--warehouse {args.warehouse} couldn't be loaded: {error}")
     random.seed(1337)
 
-    simulation = warehouseSimulator.WarehouseSimulator(args.frames_per_sec, args.mode, args.no_gui, args.verbose, args.iterations, constants.warerhouses[args.warehouse])
-    simulation.run()
+    simulation = warehouseSimulator.WarehouseSimulator(args.frames_per_sec, args.mode, args.no_gui, args.verbose, args.iterations, warehouse, args.num_votes, args.engine, args.fast_forward, args.reserve_paths, args.planner, args.profile, args.profile_output, args.telemetry, args.cache_dir)
+    if args.load_snapshot:
+        simulation.loadSnapshot(args.load_snapshot)
+    simulation.run(snapshotTick=args.snapshot_tick, snapshotPath=args.save_snapshot)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import numpy as np
+from distanceField import DistanceField
+
+
+class MapCache:
+    """
+        Directory of precomputed path information shared between processes and runs. Files are named after a hash
+        of the warehouse grid, so a changed map never picks up stale data, and are saved as .npy files that get
+        opened memory-mapped: loading them copies nothing, and every process reading the same file shares the
+        same pages.
+
+        Holds the distance field for each map, and the route library for each map and planner. Routes are
+        planned as robots ask for them, so the routes file is rewritten with any new ones at the end of a run.
+        Files are written to a temporary name and renamed into place, so workers reading and writing the same
+        directory at once never see half a file
+    """
+    # Part of every file name, bumped when the layout of the files changes
+    VERSION = 2
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, grid):
+        digest = hashlib.sha1(f"{grid.width}x{grid.height}:".encode() + grid.cells).hexdigest()[:16]
+        return f"v{self.VERSION}-{digest}"
+
+    def path(self, grid, name):
+        return os.path.join(self.directory, f"{self.key(grid)}.{name}.npy")
+
+    def save(self, path, values):
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            np.save(file, values)
+        os.replace(temporary, path)
+
+    def distanceField(self, grid):
+        """Returns the distance field for the grid, opened from the cache or built and saved there"""
+        path = self.path(grid, "fields")
+        if os.path.exists(path):
+            lengths = np.load(path, mmap_mode='r')
+            targets = DistanceField.targets(grid)
+            # Rows come back as int buffers, indexing them is as quick as the arrays DistanceField builds
+            return DistanceField(grid, {target: memoryview(row) for target, row in zip(targets, lengths)})
+        distanceField = DistanceField(grid)
+        # Mapped fields are read-only, so every flood is run to the end and nothing is left to fill in later
+        distanceField.resolveTies()
+        self.save(path, np.array([distanceField.field(*target) for target in DistanceField.targets(grid)],
+                                 dtype=np.int32).reshape(-1, grid.width * grid.height))
+        return distanceField
+
+    def loadRoutes(self, routeLibrary, planner):
+        """Adds the routes saved for the grid and planner to the route library"""
+        path = self.path(routeLibrary.grid, f"{planner}.routes")
+        if not os.path.exists(path):
+            return
+        cells = np.load(path, mmap_mode='r')
+        index = np.load(self.path(routeLibrary.grid, f"{planner}.routeIndex"), mmap_mode='r')
+        if len(index) and index[-1, 2] != len(cells):
+            # The pair of files was written by two different runs
+            return
+        view = memoryview(cells)
+        offset = 0
+        for start, end, stop in index.tolist():
+            routeLibrary.routes.setdefault((start, end), view[offset:stop])
+            offset = stop
+        routeLibrary.saved = len(routeLibrary.routes)
+
+    def saveRoutes(self, routeLibrary, planner):
+        """Writes out the route library for the grid and planner, if it has routes that weren't loaded"""
+        if len(routeLibrary.routes) == routeLibrary.saved:
+            return
+        pairs = list(routeLibrary.routes)
+        routes = [routeLibrary.routes[pair] for pair in pairs]
+        stops = np.cumsum([len(route) for route in routes], dtype=np.int64)
+        index = np.column_stack([np.array(pairs, dtype=np.int64).reshape(-1, 2), stops])
+        cells = np.concatenate([np.asarray(route, dtype=np.int32) for route in routes] + [np.zeros(0, dtype=np.int32)])
+        # Routes before index, so a reader that sees the new index also finds the routes it points into
+        self.save(self.path(routeLibrary.grid, f"{planner}.routes"), cells)
+        self.save(self.path(routeLibrary.grid, f"{planner}.routeIndex"), index)
+        routeLibrary.saved = len(routeLibrary.routes)
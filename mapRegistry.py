@@ -0,0 +1,92 @@
+import csv
+import os
+import struct
+from functools import lru_cache
+import constants
+
+
+RESOURCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+# Bundled warehouses by name, in the order -w numbers them
+MAPS = {
+    "warehouse": os.path.join(RESOURCES, "warehouse.csv"),
+    "factory_given": os.path.join(RESOURCES, "factory_given..csv"),
+    "large_rows_few_robots": os.path.join(RESOURCES, "rows.csv"),
+}
+# Packed maps start with this header: magic, format version, width and height
+HEADER = struct.Struct("<4sBII")
+MAGIC = b"WMAP"
+VERSION = 1
+CELLS = {constants.WALL, constants.FLOOR, constants.CHARGING_STATION, constants.JOB_STATION}
+
+
+def resolve(name):
+    """Turns a map number, a bundled map name or a path into the path of the file to load"""
+    if name.isdigit() and int(name) < len(MAPS):
+        return list(MAPS.values())[int(name)]
+    return MAPS.get(name, name)
+
+
+@lru_cache(maxsize=None)
+def loadMap(name):
+    """
+        Returns the layout of a warehouse as a list of rows of cell values. name is a map number or name from
+        MAPS, or the path of a .csv or packed .wmap file. Maps are only read the first time they are asked for
+    """
+    path = resolve(str(name))
+    if path.endswith(".wmap"):
+        layout = readPacked(path)
+    else:
+        with open(path, newline="") as file:
+            layout = [[int(cell) for cell in row] for row in csv.reader(file) if row]
+    validate(layout, path)
+    return layout
+
+
+def validate(layout, path):
+    """Raises a ValueError if the layout isn't a rectangle of known cells with somewhere to charge and deliver"""
+    if not layout or not layout[0]:
+        raise ValueError(f"Map {path} is empty")
+    if any(len(row) != len(layout[0]) for row in layout):
+        raise ValueError(f"Map {path} has rows of different lengths")
+    unknown = {cell for row in layout for cell in row} - CELLS
+    if unknown:
+        raise ValueError(f"Map {path} has unknown cells {sorted(unknown)}")
+    if not any(constants.CHARGING_STATION in row for row in layout):
+        raise ValueError(f"Map {path} has no charging stations")
+    # Every job goes between two different job stations
+    if sum(row.count(constants.JOB_STATION) for row in layout) < 2:
+        raise ValueError(f"Map {path} needs at least two job stations")
+
+
+def readPacked(path):
+    """Reads a .wmap file, where each cell takes two bits, four to a byte row by row"""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} isn't a version {VERSION} packed map")
+    packed = data[HEADER.size:]
+    if len(packed) != (width * height + 3) // 4:
+        raise ValueError(f"{path} is truncated")
+    cells = [(packed[index // 4] >> (index % 4 * 2)) & 3 for index in range(width * height)]
+    return [cells[y * width:(y + 1) * width] for y in range(height)]
+
+
+def savePacked(layout, path):
+    """Writes the layout as a .wmap file that readPacked loads back"""
+    cells = [cell for row in layout for cell in row]
+    packed = bytearray((len(cells) + 3) // 4)
+    for index, cell in enumerate(cells):
+        packed[index // 4] |= cell << (index % 4 * 2)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(layout[0]), len(layout)))
+        file.write(packed)
+
+
+def saveMap(layout, path):
+    """Writes the layout as a packed map if path ends in .wmap, as CSV otherwise"""
+    if path.endswith(".wmap"):
+        savePacked(layout, path)
+        return
+    with open(path, "w", newline="") as file:
+        csv.writer(file, lineterminator="\n").writerows(layout)
@@ -0,0 +1,94 @@
+import argparse
+import random
+import sys
+import constants
+import mapRegistry
+import warehouseSimulator
+from distanceField import DistanceField
+from pathEngine import PathEngine
+from warehouseGrid import WarehouseGrid
+
+
+MODES = ['a', 'b', 'c', 'd', 'e', 'f']
+
+# Ways of running the simulation that must give the same statistics as the object engine stepping every tick
+VARIANTS = {
+    "vector": {"engine": 'vector'},
+    "fast-forward": {"fastForward": True},
+    "vector fast-forward": {"engine": 'vector', "fastForward": True},
+}
+
+
+def runSimulation(mode, warehouse, seed, iterations, **options):
+    """Runs a headless simulation and returns the totals from its StatisticManager"""
+    random.seed(seed)
+    simulation = warehouseSimulator.WarehouseSimulator(0, mode, False, False, iterations, warehouse, **options)
+    simulation.run(report=False)
+    return simulation.stats.getTotals()
+
+
+def checkDistances(number, warehouse):
+    """
+        Checks the distance field's length from every walkable cell to every station, and the lengths
+        PathEngine.findLengths gives from every station to every walkable cell, against the length of the path
+        PathEngine finds between them. Returns the number of mismatches
+    """
+    grid = WarehouseGrid(warehouse)
+    distanceField = DistanceField(grid)
+    pathEngine = PathEngine(grid)
+    walkable = [grid.position(index) for index, cell in enumerate(grid.cells) if cell != constants.WALL]
+    failures = 0
+    for toX, toY in DistanceField.targets(grid):
+        for fromX, fromY in walkable:
+            expected = len(pathEngine.findPath(fromX, fromY, toX, toY))
+            actual = distanceField.pathLength(fromX, fromY, toX, toY)
+            if actual != expected:
+                failures += 1
+                print(f"    ({fromX}, {fromY}) to ({toX}, {toY}): distance field {actual}, path {expected}")
+    for fromX, fromY in DistanceField.targets(grid):
+        lengths = pathEngine.findLengths(fromX, fromY, walkable)
+        for (toX, toY), actual in zip(walkable, lengths):
+            expected = len(pathEngine.findPath(fromX, fromY, toX, toY))
+            if actual != expected:
+                failures += 1
+                print(f"    ({fromX}, {fromY}) to ({toX}, {toY}): findLengths {actual}, path {expected}")
+    print(f"warehouse {number} distance field: {'ok' if not failures else f'{failures} MISMATCHES'}")
+    return failures
+
+
+def main():
+    """
+        Checks that the vector engine and fast-forwarding produce the same statistics as the object engine stepping
+        every tick, for every mode and warehouse, and with -d that the precomputed path lengths match PathEngine
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--seeds", type=int, default=3, help="Number of seeds to try per mode and warehouse")
+    parser.add_argument("-i", "--iterations", type=int, default=2, help="Number of times to run each simulation")
+    parser.add_argument("-c", "--check", type=str, nargs='+', choices=list(VARIANTS), default=list(VARIANTS),
+                        help="Variants to check against the object engine")
+    parser.add_argument("-d", "--distances", action="store_true", default=False,
+                        help="Also check precomputed path lengths against PathEngine for every cell and station, slow")
+    args = parser.parse_args()
+
+    failures = 0
+    if args.distances:
+        for number, warehouse in enumerate(map(mapRegistry.loadMap, mapRegistry.MAPS)):
+            failures += checkDistances(number, warehouse)
+    for mode in MODES:
+        for number, warehouse in enumerate(map(mapRegistry.loadMap, mapRegistry.MAPS)):
+            for seed in range(1337, 1337 + args.seeds):
+                expected = runSimulation(mode, warehouse, seed, args.iterations)
+                for variant in args.check:
+                    actual = runSimulation(mode, warehouse, seed, args.iterations, **VARIANTS[variant])
+                    print(f"mode {mode} warehouse {number} seed {seed} {variant}: {'ok' if actual == expected else 'MISMATCH'}")
+                    if actual != expected:
+                        failures += 1
+                        print(f"    expected: {expected}")
+                        print(f"    actual:   {actual}")
+
+    print(f"{failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
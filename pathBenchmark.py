@@ -0,0 +1,136 @@
+import argparse
+import random
+import time
+import constants
+import mapRegistry
+from warehouseGrid import WarehouseGrid
+from pathEngine import PathEngine
+from landmarkEngine import LandmarkEngine
+from batchRunner import printTable
+from warehouseSimulator import PLANNERS
+
+
+def tileWarehouse(warehouse, times):
+    """
+        Repeats the warehouse layout times x times, a quick way to get a map closer to a real building's size. The
+        outer walls of neighbouring copies are opened up wherever there is floor on both sides so the copies join
+        into one building
+    """
+    width = len(warehouse[0])
+    height = len(warehouse)
+    tiled = [row * times for _ in range(times) for row in warehouse]
+    for seam in range(1, times):
+        x0, x1 = seam * width - 1, seam * width
+        for row in tiled:
+            if row[x0 - 1] != constants.WALL and row[x1 + 1] != constants.WALL:
+                row[x0] = row[x1] = constants.FLOOR
+        y0, y1 = seam * height - 1, seam * height
+        for x in range(width * times):
+            if tiled[y0 - 1][x] != constants.WALL and tiled[y1 + 1][x] != constants.WALL:
+                tiled[y0][x] = tiled[y1][x] = constants.FLOOR
+    return tiled
+
+
+def largestArea(grid):
+    """Returns the indices of the cells in the biggest connected area of the warehouse"""
+    seen = set()
+    largest = []
+    for index, cell in enumerate(grid.cells):
+        if cell == constants.WALL or index in seen:
+            continue
+        area = [index]
+        seen.add(index)
+        for current in area:
+            for neighbor in grid.neighbors(current):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    area.append(neighbor)
+        if len(area) > len(largest):
+            largest = area
+    return largest
+
+
+def pathCost(grid, path):
+    """Cost of walking the path, every cell but the first costs its weight"""
+    return sum(grid.cells[cell] for cell in path.remainingCells()[1:])
+
+
+def uniformWarehouse(warehouse):
+    """Copy of the warehouse where every cell that isn't a wall costs the same to step onto"""
+    return [[constants.FLOOR if cell != constants.WALL else constants.WALL for cell in row] for row in warehouse]
+
+
+def benchmark(warehouse, planners, numPairs, numLandmarks, seed):
+    """
+        Runs the same random searches through plain A* and each of the planners, checks they come up with paths
+        that are just as good and returns a row per planner with how many nodes and how long it took. Planners
+        that ignore cell weights are compared against A* on a copy of the warehouse where every cell costs the same
+    """
+    grids = {True: WarehouseGrid(warehouse), False: WarehouseGrid(uniformWarehouse(warehouse))}
+    # Only pick cells that can reach each other so every search has an answer
+    reachable = sorted(largestArea(grids[True]))
+    rng = random.Random(seed)
+    pairs = [[grids[True].position(index) for index in rng.sample(reachable, 2)] for _ in range(numPairs)]
+
+    def run(engine):
+        start = time.perf_counter()
+        paths = [engine.findPath(x1, y1, x2, y2) for (x1, y1), (x2, y2) in pairs]
+        return paths, time.perf_counter() - start
+
+    # Plain A* on each grid, run once and shared by every planner using that grid
+    references = {}
+    rows = []
+    for name in planners:
+        planner = PLANNERS[name]
+        grid = grids[planner.WEIGHTED]
+        start = time.perf_counter()
+        engine = planner(grid, numLandmarks) if planner is LandmarkEngine else planner(grid)
+        setupTime = time.perf_counter() - start
+        paths, seconds = run(engine)
+
+        if planner.WEIGHTED not in references:
+            reference = PathEngine(grid)
+            references[planner.WEIGHTED] = (reference, run(reference)[0])
+        reference, referencePaths = references[planner.WEIGHTED]
+        for path, referencePath in zip(paths, referencePaths):
+            if pathCost(grid, path) != pathCost(grid, referencePath):
+                raise RuntimeError(f"{name} path {path} costs more than {referencePath}")
+
+        rows.append({
+            "planner": name,
+            "weights": "cell" if planner.WEIGHTED else "uniform",
+            "size": f"{grid.width}x{grid.height}",
+            "searches": numPairs,
+            "nodes": engine.expanded,
+            "astarNodes": reference.expanded,
+            "nodeRatio": f"{engine.expanded / max(reference.expanded, 1):.2f}",
+            "seconds": f"{seconds:.3f}",
+            "setupSeconds": f"{setupTime:.3f}",
+        })
+    return rows
+
+
+def main():
+    """Compares the nodes expanded by each path planner against plain A* on the bundled warehouses"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-w", "--warehouses", type=str, nargs='+', default=[str(number) for number in range(len(mapRegistry.MAPS))],
+                        help="Warehouses to search in, by number, name or path like main.py -w")
+    parser.add_argument("-p", "--planners", type=str, nargs='+', choices=list(PLANNERS), default=list(PLANNERS),
+                        help="Path planners to compare")
+    parser.add_argument("-n", "--num-pairs", type=int, default=200, help="Number of random searches per warehouse")
+    parser.add_argument("-l", "--landmarks", type=int, default=8, help="Number of landmarks to precompute")
+    parser.add_argument("-t", "--tile", type=int, default=1,
+                        help="Repeat each warehouse this many times in both directions to make a bigger map")
+    parser.add_argument("-s", "--seed", type=int, default=1337, help="Seed for picking the searches")
+    args = parser.parse_args()
+
+    rows = []
+    for warehouse in args.warehouses:
+        layout = tileWarehouse(mapRegistry.loadMap(warehouse), args.tile)
+        for row in benchmark(layout, args.planners, args.num_pairs, args.landmarks, args.seed):
+            rows.append({"warehouse": warehouse, **row})
+    printTable(rows, list(rows[0].keys()))
+
+
+if __name__ == '__main__':
+    main()
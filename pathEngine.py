@@ -0,0 +1,190 @@
+import heapq
+from array import array
+
+
+class Path:
+    """
+        Path through the warehouse stored as packed cell indices (y * width + x) and walked with a cursor, so taking
+        the next step is O(1) and nothing is copied. Indexing, iterating and len only see the steps that are left,
+        with positions handed out as (x, y) tuples. Slicing off the front shares the cells with the original
+    """
+    __slots__ = ('cells', 'width', 'cursor')
+
+    def __init__(self, cells=(), width=1, cursor=0):
+        self.cells = cells
+        self.width = width
+        self.cursor = cursor
+
+    def __len__(self):
+        return len(self.cells) - self.cursor
+
+    def __bool__(self):
+        return self.cursor < len(self.cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1 and stop == len(self):
+                return Path(self.cells, self.width, self.cursor + start)
+            return Path(array('i', self.cells[self.cursor + start:self.cursor + stop:step]), self.width)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("path index out of range")
+        cell = self.cells[self.cursor + index]
+        return cell % self.width, cell // self.width
+
+    def __iter__(self):
+        width = self.width
+        for cell in self.cells[self.cursor:]:
+            yield cell % width, cell // width
+
+    def __repr__(self):
+        return f"Path({list(self)})"
+
+    def remainingCells(self):
+        """Packed indices of the steps that are left"""
+        return self.cells[self.cursor:]
+
+    def advance(self):
+        """Takes the next step off the path and returns its (x, y)"""
+        if not self:
+            raise IndexError("advance on an empty path")
+        cell = self.cells[self.cursor]
+        self.cursor += 1
+        return cell % self.width, cell // self.width
+
+
+class PathEngine:
+    """
+        Shared path finding service for every robot in the simulation. Searches run A* over the shared
+        WarehouseGrid, treating cell values as the cost of stepping onto a cell. All of the bookkeeping for a
+        search lives in local variables, so nothing has to be cleaned up between searches and several
+        threads can use the same engine at once. The only shared state is a pair of counters for how many
+        searches were run and how many nodes they expanded, which are only there to compare planners
+
+        Subclasses can guide the search with a better heuristic by overriding heuristic, or swap out the search
+        altogether by overriding findPath
+    """
+    # Whether paths are cheapest by cell weight, planners that aren't find the path with the fewest steps instead
+    WEIGHTED = True
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.searches = 0
+        self.expanded = 0
+
+    def printReport(self):
+        print(f"    Path Searches: {self.searches}")
+        print(f"    Nodes Expanded: {self.expanded} ({self.expanded / max(self.searches, 1):.1f} per search)")
+
+    def heuristic(self, startX, startY, endX, endY):
+        """
+            Returns a function giving a lower bound on the cost from a cell index to (endX, endY) for a search
+            starting at (startX, startY). Plain A* uses the manhattan distance times the cheapest step
+        """
+        width = self.grid.width
+        minWeight = self.grid.minWeight
+
+        def estimate(node):
+            return (abs(node % width - endX) + abs(node // width - endY)) * minWeight
+
+        return estimate
+
+    def findPath(self, startX, startY, endX, endY):
+        """
+            Returns the cheapest path from (startX, startY) to (endX, endY) as a Path including both ends, or an
+            empty Path if the end can't be reached
+        """
+        grid = self.grid
+        width = grid.width
+        cells = grid.cells
+        lowerBound = self.heuristic(startX, startY, endX, endY)
+        start = startY * width + startX
+        end = endY * width + endX
+        self.searches += 1
+
+        costs = {start: 0}
+        estimates = {start: 0}
+        parents = {start: None}
+        closed = set()
+        # Ties on the estimate go to whichever cell was opened first
+        pushed = 0
+        heap = [(0, pushed, start)]
+        while heap:
+            estimate, _, node = heapq.heappop(heap)
+            if estimate > estimates[node]:
+                continue
+            closed.add(node)
+            self.expanded += 1
+            if node == end:
+                return self.backtrace(parents, end)
+
+            cost = costs[node]
+            for neighbor in grid.neighbors(node):
+                if neighbor in closed:
+                    continue
+                newCost = cost + cells[neighbor]
+                if neighbor not in costs or newCost < costs[neighbor]:
+                    costs[neighbor] = newCost
+                    estimates[neighbor] = newCost + lowerBound(neighbor)
+                    parents[neighbor] = node
+                    pushed += 1
+                    heapq.heappush(heap, (estimates[neighbor], pushed, neighbor))
+
+        return Path(width=width)
+
+    def findLengths(self, startX, startY, targets):
+        """
+            Returns the number of cells in the cheapest path from (startX, startY) to each of the (x, y) targets,
+            or 0 for targets that can't be reached, from a single Dijkstra search that stops once every target is
+            settled. The fewest and most cells over the cheapest paths are tracked along the way, and where they
+            differ for a target the path findPath picks is searched for, so lengths always match findPath
+        """
+        grid = self.grid
+        width = grid.width
+        cells = grid.cells
+        start = startY * width + startX
+        remaining = {y * width + x for x, y in targets}
+        self.searches += 1
+
+        costs = {start: 0}
+        fewest = {start: 0}
+        most = {start: 0}
+        lengths = {}
+        heap = [(0, start)]
+        while heap and remaining:
+            cost, node = heapq.heappop(heap)
+            if cost != costs[node]:
+                continue
+            self.expanded += 1
+            # Every step costs something, so every cheapest way here was counted before this pop
+            lengths[node] = fewest[node] + 1 if fewest[node] == most[node] else None
+            remaining.discard(node)
+            for neighbor in grid.neighbors(node):
+                newCost = cost + cells[neighbor]
+                if neighbor not in costs or newCost < costs[neighbor]:
+                    costs[neighbor] = newCost
+                    fewest[neighbor] = fewest[node] + 1
+                    most[neighbor] = most[node] + 1
+                    heapq.heappush(heap, (newCost, neighbor))
+                elif newCost == costs[neighbor]:
+                    fewest[neighbor] = min(fewest[neighbor], fewest[node] + 1)
+                    most[neighbor] = max(most[neighbor], most[node] + 1)
+
+        found = []
+        for x, y in targets:
+            length = lengths.get(y * width + x, 0)
+            if length is None:
+                length = len(self.findPath(startX, startY, x, y))
+            found.append(length)
+        return found
+
+    def backtrace(self, parents, end):
+        cells = array('i')
+        node = end
+        while node is not None:
+            cells.append(node)
+            node = parents[node]
+        cells.reverse()
+        return Path(cells, self.grid.width)
@@ -0,0 +1,94 @@
+import cProfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Profiler:
+    """
+        Opt-in timing for the simulation. Each tick is split into phases (the warehouse manager handing out jobs,
+        the robots updating, fast forwarding and drawing), and the time spent in each one is added up per tick so
+        the report can show both the total and the worst tick. The robot methods that make up an update are timed
+        on their own as well, along with how many path searches were run and how many nodes they expanded.
+
+        With an output file the whole run is also recorded with cProfile and dumped there in pstats format, which
+        snakeviz, gprof2dot or flameprof can turn into a call graph or flame graph
+    """
+    # Robot methods timed separately, in the order Robot.update calls them
+    ROBOT_PHASES = ["updateCharging", "evaluateJobProgress", "getPath", "move"]
+
+    def __init__(self, pathEngine, output=None):
+        self.pathEngine = pathEngine
+        self.output = output
+        self.cProfile = cProfile.Profile() if output else None
+        self.totals = defaultdict(float)
+        self.worst = defaultdict(float)
+        self.current = defaultdict(float)
+        self.numTicks = 0
+        self.wallTime = 0
+        self.startSearches = pathEngine.searches
+        self.startExpanded = pathEngine.expanded
+        self.startTime = None
+
+    def start(self):
+        self.startTime = time.perf_counter()
+        if self.cProfile:
+            self.cProfile.enable()
+
+    def stop(self):
+        if self.cProfile:
+            self.cProfile.disable()
+            self.cProfile.dump_stats(self.output)
+        self.wallTime += time.perf_counter() - self.startTime
+
+    @contextmanager
+    def phase(self, name):
+        """Adds the time spent inside the with block to the named phase for this tick"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter() - start
+
+    def endTick(self):
+        """Folds this tick's phase times into the totals"""
+        for name, seconds in self.current.items():
+            self.totals[name] += seconds
+            self.worst[name] = max(self.worst[name], seconds)
+        self.current.clear()
+        self.numTicks += 1
+
+    def instrument(self, robots):
+        """Times the robot methods in ROBOT_PHASES by wrapping them on each robot"""
+        for robot in robots:
+            for name in self.ROBOT_PHASES:
+                setattr(robot, name, self.timed(f"robot.{name}", getattr(robot, name)))
+
+    def timed(self, name, method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.current[name] += time.perf_counter() - start
+        return wrapper
+
+    def printReport(self):
+        title = "PROFILE:"
+        print(title)
+        print("=" * len(title))
+        ticks = max(self.numTicks, 1)
+        print(f"    Ticks: {self.numTicks} in {self.wallTime:.3f}s ({self.numTicks / max(self.wallTime, 1e-9):.1f} ticks/s)")
+        width = max(len(name) for name in self.totals) if self.totals else 0
+        print(f"    {'phase'.ljust(width)}  {'total s':>9}  {'ms/tick':>8}  {'worst ms':>8}  {'share':>6}")
+        for name, seconds in self.totals.items():
+            print(f"    {name.ljust(width)}  {seconds:9.3f}  {seconds / ticks * 1000:8.3f}  "
+                  f"{self.worst[name] * 1000:8.3f}  {seconds / max(self.wallTime, 1e-9):6.1%}")
+        searches = self.pathEngine.searches - self.startSearches
+        expanded = self.pathEngine.expanded - self.startExpanded
+        print(f"    Path Searches: {searches} ({searches / ticks:.2f} per tick)")
+        print(f"    Nodes Expanded: {expanded} ({expanded / max(searches, 1):.1f} per search)")
+        if self.output:
+            print(f"    cProfile stats written to {self.output}")
@@ -0,0 +1,150 @@
+import heapq
+from array import array
+import constants
+from pathEngine import Path
+
+
+class ReservationTable:
+    """
+        Space-time reservations shared by all robots, used to plan paths that don't run into each other
+        (cooperative A*). Every planned path reserves the cell the robot will be in at each tick along it, and the
+        robot then keeps its final cell until it plans again. Later plans have to work around earlier ones, waiting
+        in place or taking a detour when a cell is taken. Job stations act as docks that several robots can share,
+        so they are never reserved.
+
+        The simulator keeps tick up to date; plans start at the current tick with the robot's current cell, the same
+        format PathEngine.findPath uses
+    """
+    # Search budget for one plan, plans that can't be found within it fall back to ignoring other robots
+    MAX_EXPANSIONS = 20000
+    WAIT_COST = 1
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.tick = 0
+        # cell -> {tick: robot}, the robot that will be in the cell at that tick
+        self.reserved = {}
+        # cell -> (robot, tick), robots holding on to a cell from that tick onwards
+        self.parked = {}
+        # robot -> (plan start tick, [(cell, tick)]) so a robot's reservations can be released when it plans again
+        self.plans = {}
+
+    def isShared(self, cell):
+        return self.grid.cells[cell] == constants.JOB_STATION
+
+    def isFree(self, cell, tick, name):
+        """Returns true if no other robot has the cell at the given tick"""
+        if self.isShared(cell):
+            return True
+        holder = self.reserved.get(cell, {}).get(tick, name)
+        if holder != name:
+            return False
+        parked = self.parked.get(cell)
+        return parked is None or parked[0] == name or parked[1] > tick
+
+    def isClear(self, name, x, y):
+        """Returns true if the robot can be in the cell at (x, y) this tick"""
+        return self.isFree(self.grid.index(x, y), self.tick, name)
+
+    def canPark(self, cell, tick, name):
+        """Returns true if the robot can stay in the cell from the given tick onwards"""
+        if self.isShared(cell):
+            return True
+        parked = self.parked.get(cell)
+        if parked is not None and parked[0] != name:
+            return False
+        return all(holder == name for reservedTick, holder in self.reserved.get(cell, {}).items() if reservedTick >= tick)
+
+    def release(self, name):
+        """Drops every reservation the robot holds"""
+        _, reservations = self.plans.pop(name, (None, []))
+        for cell, tick in reservations:
+            ticks = self.reserved[cell]
+            if ticks.get(tick) == name:
+                del ticks[tick]
+        for cell in [cell for cell, (holder, _) in self.parked.items() if holder == name]:
+            del self.parked[cell]
+
+    def park(self, name, x, y):
+        """Reserves the robot's current cell for it from now on"""
+        self.release(name)
+        cell = self.grid.index(x, y)
+        if not self.isShared(cell):
+            self.parked[cell] = (name, self.tick)
+        self.plans[name] = (self.tick, [])
+
+    def reserve(self, name, path):
+        """Reserves every cell along the path from the current tick, then the last cell for good"""
+        self.release(name)
+        reservations = []
+        cells = path.remainingCells()
+        for step, cell in enumerate(cells):
+            if not self.isShared(cell):
+                self.reserved.setdefault(cell, {})[self.tick + step] = name
+                reservations.append((cell, self.tick + step))
+        self.plans[name] = (self.tick, reservations)
+        if cells:
+            goal = cells[-1]
+            if not self.isShared(goal):
+                self.parked[goal] = (name, self.tick + len(cells) - 1)
+
+    def isWaiting(self, name, x, y, nextX, nextY):
+        """Returns true if stepping from (x, y) to (nextX, nextY) is the robot waiting in place partway through a plan"""
+        return (x, y) == (nextX, nextY) and name in self.plans and self.plans[name][0] < self.tick
+
+    def planPath(self, name, startX, startY, endX, endY):
+        """
+            Plans a path that doesn't collide with any other robot's reservations and reserves it. Returns None if
+            no such path could be found, in which case the robot keeps no reservations
+        """
+        self.release(name)
+        grid = self.grid
+        width = grid.width
+        cells = grid.cells
+        start = grid.index(startX, startY)
+        goal = grid.index(endX, endY)
+        tick = self.tick
+
+        costs = {(start, tick): 0}
+        parents = {(start, tick): None}
+        closed = set()
+        pushed = 0
+        heap = [(0, pushed, start, tick)]
+        expansions = 0
+        while heap and expansions < self.MAX_EXPANSIONS:
+            _, _, cell, cellTick = heapq.heappop(heap)
+            state = (cell, cellTick)
+            if state in closed:
+                continue
+            closed.add(state)
+            expansions += 1
+            if cell == goal and self.canPark(cell, cellTick, name):
+                steps = array('i')
+                while state is not None:
+                    steps.append(state[0])
+                    state = parents[state]
+                steps.reverse()
+                path = Path(steps, width)
+                self.reserve(name, path)
+                return path
+
+            nextTick = cellTick + 1
+            for neighbor in grid.neighbors(cell) + [cell]:
+                nextState = (neighbor, nextTick)
+                if nextState in closed or not self.isFree(neighbor, nextTick, name):
+                    continue
+                # Two robots can't swap cells in one tick
+                if neighbor != cell and not self.isShared(cell) and \
+                        self.reserved.get(neighbor, {}).get(cellTick, name) != name and \
+                        self.reserved.get(cell, {}).get(nextTick) == self.reserved[neighbor][cellTick]:
+                    continue
+                newCost = costs[state] + (cells[neighbor] if neighbor != cell else self.WAIT_COST)
+                if nextState not in costs or newCost < costs[nextState]:
+                    costs[nextState] = newCost
+                    parents[nextState] = state
+                    x, y = neighbor % width, neighbor // width
+                    pushed += 1
+                    heapq.heappush(heap, (newCost + (abs(x - endX) + abs(y - endY)) * grid.minWeight, pushed,
+                                          neighbor, nextTick))
+
+        return None
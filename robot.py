@@ -1,11 +1,11 @@
 
-from pathfinding.core.diagonal_movement import DiagonalMovement
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
 import math
 import random
-from itertools import permutations
-from dataclasses import dataclass
+import numpy as np
+from assignment import rankAssignments
+from dataclasses import replace
+from pathEngine import Path
+from votingEngine import distanceMatrix, bordaVotes, rankedVotes
 
 
 MIN_UTIL = -1000
@@ -25,26 +25,33 @@ class Robot:
     BATTERY_MOVE_COST = 2
     BATTERY_IDLE_COST = 1
 
-    def __init__(self, pos, warehouse, jobList, statisticManager, name, verbose):
+    def __init__(self, pos, pathEngine, distances, jobStore, statisticManager, name, verbose, reservations=None,
+                 spatialIndex=None):
         self.verbose = verbose
         self.x = pos[1]
         self.y = pos[0]
         self.chargingPoint = pos
         self.batteryPercent = random.randint(math.floor(
             (self.MAX_CHARGE / 3)), math.floor(self.MAX_CHARGE * 2 / 3))
-        self.grid = Grid(matrix=warehouse)
-        self.path = []
+        self.pathEngine = pathEngine
+        self.distances = distances
+        self.path = Path()
         self.jobQueue = []
         self.jobStatus = self.JOB_UNASSIGNED
         self.currentJob = None
         self.needCharge = False
         self.chargingPath = False
-        self.jobList = jobList
-        self.finder = AStarFinder(diagonal_movement=DiagonalMovement.never)
+        self.jobStore = jobStore
         self.stats = statisticManager
         self.name = name
-        self.utils = {}
-        self.neighbors = {}
+        # Shared ReservationTable when robots plan around each other, otherwise they drive through one another
+        self.reservations = reservations
+        if self.reservations is not None:
+            self.reservations.park(self.name, self.x, self.y)
+        # Shared SpatialIndex of where every robot is, kept up to date as the robot moves
+        self.spatialIndex = spatialIndex
+        if self.spatialIndex is not None:
+            self.spatialIndex.add(self)
 
     def update(self, chargingStations=None, statManager=None):
         """
@@ -78,9 +85,7 @@ class Robot:
         """ 
             Updates the battery percentage based on the situation
         """
-        self.grid.cleanup()
-        costToChargeStation = len(self.finder.find_path(self.grid.node(self.x, self.y), self.grid.node(
-            self.chargingPoint[1], self.chargingPoint[0]), self.grid)[0]) * self.BATTERY_MOVE_COST + self.BATTERY_MOVE_COST
+        costToChargeStation = self.getCostToChargeStation(self.x, self.y)
         # If it's at the charging station, then charge
         if self.y == self.chargingPoint[0] and self.x == self.chargingPoint[1] and self.batteryPercent < self.MAX_CHARGE:
             self.batteryPercent = min(
@@ -103,6 +108,27 @@ class Robot:
             self.chargingPath = False
             self.endCharging()
 
+    def getCostToChargeStation(self, x, y):
+        """Battery needed to make it from (x, y) back to the charging station, with one move to spare"""
+        return self.distances.pathLength(x, y, self.chargingPoint[1], self.chargingPoint[0]) * self.BATTERY_MOVE_COST \
+            + self.BATTERY_MOVE_COST
+
+    def planPath(self, startX, startY, endX, endY):
+        """
+            Finds the path the robot should take. With reservations the path works around every other robot's plan,
+            waiting or detouring where it has to; if the robot is boxed in it falls back to the plain shortest path
+            and tries again as soon as something is in its way
+        """
+        if self.reservations is None:
+            return self.pathEngine.findPath(startX, startY, endX, endY)
+        path = self.reservations.planPath(self.name, startX, startY, endX, endY)
+        if path is None:
+            path = self.pathEngine.findPath(startX, startY, endX, endY)
+            self.stats.congestion += 1
+        elif len(path) > self.distances.pathLength(startX, startY, endX, endY):
+            self.stats.congestion += 1
+        return path
+
     def chargeRobot(self):
         """ 
             Get the path from the robot to their charging station and if they have not started the job yet, returns the job
@@ -113,20 +139,14 @@ class Robot:
             if self.currentJob and self.verbose:
                 print(
                     f"Robot needs charging, pausing job ({self.currentJob.startX}, {self.currentJob.startY}) to ({self.currentJob.endX}, {self.currentJob.endY})")
-            self.path = []
-            self.grid.cleanup()
-            start = self.grid.node(self.x, self.y)
-            end = self.grid.node(self.chargingPoint[1], self.chargingPoint[0])
-            path, _ = self.finder.find_path(start, end, self.grid)
-            self.path = path
+            self.path = self.planPath(self.x, self.y, self.chargingPoint[1], self.chargingPoint[0])
             self.chargingPath = True
             if self.jobStatus == self.JOB_STARTED:
                 if self.verbose:
                     print(
                         f"Job not in progress, returning job ({self.currentJob.startX}, {self.currentJob.startY}) to ({self.currentJob.endX}, {self.currentJob.endY})")
                 self.jobStatus == self.JOB_UNASSIGNED
-                self.currentJob.assigned = False
-                self.jobList.append(self.currentJob)
+                self.jobStore.release(self.currentJob)
                 self.currentJob = None
 
     def endCharging(self):
@@ -137,16 +157,9 @@ class Robot:
 
         if self.jobStatus != self.JOB_UNASSIGNED and self.currentJob:
             # If robot was currently working on a job, then return to that job
-            self.grid.cleanup()
-            start = None
-            end = None
             job = self.currentJob
-            # If they have not started the job, go to the start
-            start = self.grid.node(self.x, self.y)
-            end = self.grid.node(job.endX, job.endY)
             self.jobStatus = self.JOB_IN_PROGRESS
-            path, _ = self.finder.find_path(start, end, self.grid)
-            self.path = path
+            self.path = self.planPath(self.x, self.y, job.endX, job.endY)
             if self.verbose:
                 print(
                     f"Returning to job from ({job.startX}, {job.startY}) to ({job.endX}, {job.endY})")
@@ -154,30 +167,24 @@ class Robot:
             self.startNewJob()
 
     def checkChargeBeforeJob(self, job):
-        self.grid.cleanup()
         needsCharge = False
         jobCost = 0
 
         # Calculate the number of steps to be able to start the job if we need to
         if self.x != job.startX and self.y != job.startY:
-            start = self.grid.node(self.x, self.y)
-            end = self.grid.node(job.startX, job.startY)
-            path, _ = self.finder.find_path(start, end, self.grid)
-            jobCost += len(path) * self.BATTERY_MOVE_COST
+            jobCost += self.distances.pathLength(self.x, self.y, job.startX, job.startY) * self.BATTERY_MOVE_COST
 
         # Calculate the number of steps to complete the job once it's started
-        self.grid.cleanup()
-        start = self.grid.node(job.startX, job.startY)
-        end = self.grid.node(job.endX, job.endY)
-        path, _ = self.finder.find_path(start, end, self.grid)
-        jobCost += len(path) * self.BATTERY_MOVE_COST
+        jobCost += self.distances.pathLength(job.startX, job.startY, job.endX, job.endY) * self.BATTERY_MOVE_COST
+
+        # Lengths are never negative, so if the job alone needs more than the battery holds the way back can't
+        # change the answer. Looking it up would flood the robot's charger field out to wherever the job ends
+        if self.batteryPercent < jobCost:
+            return True
 
         # Calculate the number of steps to make it to the charging station after the job is completed
-        self.grid.cleanup()
-        start = self.grid.node(job.endX, job.endY)
-        end = self.grid.node(self.chargingPoint[1], self.chargingPoint[0])
-        path, _ = self.finder.find_path(start, end, self.grid)
-        jobCost += len(path) * self.BATTERY_MOVE_COST
+        jobCost += self.distances.pathLength(job.endX, job.endY, self.chargingPoint[1],
+                                                 self.chargingPoint[0]) * self.BATTERY_MOVE_COST
 
         if self.batteryPercent < jobCost:
             needsCharge = True
@@ -188,8 +195,6 @@ class Robot:
         """Grabs the next job in the job queue and starts a path to the starting job station"""
         job = self.jobQueue[0]
         self.currentJob = job
-        start = None
-        end = None
 
         # If the robot won't have enough battery to finish the job, send it to charge before starting the job
         if self.checkChargeBeforeJob(job):
@@ -201,7 +206,6 @@ class Robot:
         else:
             # Check and see if we are already on top of the job station that is the starting point. If not, we need
             # to first navigate to the starting node before the job can be in progress
-            self.grid.cleanup()
             if self.x == job.startX and self.y == job.startY:
                 if job.fake:
                     self.jobStatus = self.JOB_UNASSIGNED
@@ -212,16 +216,12 @@ class Robot:
                             f"robot {self.name} arrives at {job.startX}, {job.startY} to find the job already started")
                     return
                 else:
-                    start = self.grid.node(job.startX, job.startY)
-                    end = self.grid.node(job.endX, job.endY)
+                    self.path = self.planPath(job.startX, job.startY, job.endX, job.endY)
                     self.jobStatus = self.JOB_IN_PROGRESS
             else:
-                start = self.grid.node(self.x, self.y)
-                end = self.grid.node(job.startX, job.startY)
+                self.path = self.planPath(self.x, self.y, job.startX, job.startY)
                 self.jobStatus = self.JOB_STARTED
 
-            path, _ = self.finder.find_path(start, end, self.grid)
-            self.path = path
             if self.verbose:
                 print(
                     f"robot '{self.name}' is starting job from ({job.startX}, {job.startY}) to ({job.endX}, {job.endY})")
@@ -237,12 +237,8 @@ class Robot:
                     f"robot {self.name} arrives at {job.startX}, {job.startY} to find the job already started")
             self.jobQueue.pop(0)
             return
-        self.grid.cleanup()
         self.jobStatus = self.JOB_IN_PROGRESS
-        start = self.grid.node(job.startX, job.startY)
-        end = self.grid.node(job.endX, job.endY)
-        path, _ = self.finder.find_path(start, end, self.grid)
-        self.path = path
+        self.path = self.planPath(job.startX, job.startY, job.endX, job.endY)
 
     def evaluateJobProgress(self):
         """ 
@@ -260,42 +256,36 @@ class Robot:
                 self.jobStatus = self.JOB_UNASSIGNED
                 self.currentJob = None
 
-    def updateUtils(self, jobs, tick):
+    def getUtils(self, jobs, tick):
+        """
+            Returns the utility of each job for this robot, which is the negative length of the path to the end of
+            the job from wherever the robot will be free
+        """
         if self.jobStatus == self.JOB_UNASSIGNED:
-            start = self.grid.node(self.x, self.y)
+            startX, startY = self.x, self.y
         else:
-            start = self.grid.node(self.currentJob.endX, self.currentJob.endY)
-        for job in jobs:
-            end = self.grid.node(job.endX, job.endY)
-            self.grid.cleanup()
-            self.utils[job] = (-len(self.finder.find_path(start,
-                               end, self.grid)[0]), tick)
-
-    def getUtils(self, jobs, tick):
-        utils = []
-        toUpdate = [
-            job for job in jobs if job not in self.utils or self.utils[job][1] < tick]
-        self.updateUtils(toUpdate, tick)
-        for job in jobs:
-            utils.append(self.utils[job][0])
-        return utils
-
-    def updateNeighbors(self, robots, tick):
-        start = self.grid.node(self.x, self.y)
-        for robot in robots:
-            end = self.grid.node(robot.x, robot.y)
-            self.grid.cleanup()
-            self.neighbors[robot] = (len(self.finder.find_path(start, end, self.grid)[
-                                     0]), tick) if robot != self else (0, tick)
+            startX, startY = self.currentJob.endX, self.currentJob.endY
+        return [-length for length in self.distances.pathLengths(startX, startY, [(job.endX, job.endY) for job in jobs])]
 
     def getNeighbors(self, robots, tick):
-        neighbors = []
-        toUpdate = [
-            robot for robot in robots if robot not in self.neighbors or self.neighbors[robot][1] < tick]
-        self.updateNeighbors(robots, tick)
-        for robot in robots:
-            neighbors.append(self.neighbors[robot][0])
-        return neighbors
+        """Returns the length of the path from this robot to each of the robots, all found with one search"""
+        lengths = self.distances.pathLengths(self.x, self.y, [(robot.x, robot.y) for robot in robots])
+        return [0 if robot == self else length for robot, length in zip(robots, lengths)]
+
+    def getClosestRobots(self, robots, numVotes):
+        """
+            Returns (index, path length) for the numVotes robots with the shortest paths from this one, the same
+            ones sorting getNeighbors would give. Robots are looked up in the spatial index nearest first, and only
+            until no robot further out can have a path as short as the ones found, since a path is never shorter
+            than the manhattan distance
+        """
+        indices = {robot: i for i, robot in enumerate(robots)}
+        closest = self.spatialIndex.nearest(
+            self.x, self.y, numVotes,
+            distances=lambda found: [0 if robot == self else length for robot, length in
+                                     zip(found, self.distances.pathLengths(self.x, self.y, [(robot.x, robot.y) for robot in found]))],
+            include=lambda robot: robot in indices, tiebreak=indices.get)
+        return [(indices[robot], length) for robot, length in closest]
 
     def getVotes(self, robots, jobs, tick, numVotes, honest):
         if len(jobs) <= 0:
@@ -304,10 +294,13 @@ class Robot:
         selfIndex = robots.index(self)
 
         # Get Distance to Neighbors, and Find Closes
-        neighbors = self.getNeighbors(robots, tick)
-        neighbors = [(i, neighbors[i]) for i in range(len(neighbors))]
-        neighbors = sorted(neighbors, reverse=False, key=lambda x: x[1])
-        closestRobots = neighbors[:min(len(neighbors), numVotes)]
+        if self.spatialIndex is not None:
+            closestRobots = self.getClosestRobots(robots, numVotes)
+        else:
+            neighbors = self.getNeighbors(robots, tick)
+            neighbors = [(i, neighbors[i]) for i in range(len(neighbors))]
+            neighbors = sorted(neighbors, reverse=False, key=lambda x: x[1])
+            closestRobots = neighbors[:min(len(neighbors), numVotes)]
 
         # Find Distance to Jobs, and Get Closest (Utility is Negative Dist)
         dist = self.getUtils(jobs, tick)
@@ -330,43 +323,25 @@ class Robot:
             for i in range(len(closestJobs) - len(utils)):
                 utils.append([MIN_UTIL for _ in range(len(closestJobs))])
 
-        # Find all Possible Assignments
-        perms = [perm for perm in permutations([i for i in range(
-            max(len(closestRobots), len(closestJobs)))], len(closestJobs))]
-
-        # Voting Matrix votes[i][j] Equals jth Preference for ith Job
-        votes = [[-1 for _ in range(max(len(closestRobots), len(closestJobs)))]
-                 for _ in range(len(closestJobs))]
-
         if honest:
             # Honest Robots Vote to Maximize total Utility
-            def maximizer(x): return sum([utils[j][i]
-                                          for i, j in enumerate(x)])
+            weights = utils
         else:
-            # Dishonest Robots Vote to Maximize Own Utility
-
-            def maximizer(x): return utils[selfNumber][x.index(
-                selfNumber)] if selfNumber in x else MIN_UTIL
+            # Dishonest Robots Vote to Maximize Own Utility. Only their own row counts, shifted so that
+            # assignments which leave them out score MIN_UTIL like the rest
+            weights = [[utils[selfNumber][job] - MIN_UTIL if row == selfNumber else 0 for job in range(len(closestJobs))]
+                       for row in range(len(utils))]
 
-        for i in range(min(numVotes, len(jobs))):
-            # Find Best Remaining Valid Permutaiton
-            best = max(perms, key=maximizer)
+        # Each Round of Votes is the Best Assignment that Doesn't Reuse a Robot for a Job from an Earlier Round
+        rounds = rankAssignments(weights, len(closestJobs), min(numVotes, len(jobs)))
 
-            # Assign Best Permutation to First Place votes
+        # Voting Matrix votes[i][j] Equals jth Preference for ith Job
+        votes = [[-1 for _ in range(max(len(closestRobots), len(closestJobs)))]
+                 for _ in range(len(closestJobs))]
+        for i, best in enumerate(rounds):
             for j in range(len(votes)):
                 votes[j][i] = best[j]
 
-            # Remove All Permutations which Overlap with Best
-            newPerms = []
-            for perm in perms:
-                toAdd = True
-                for k, assign in enumerate(best):
-                    if perm[k] == assign:
-                        toAdd = False
-                if toAdd:
-                    newPerms.append(perm)
-            perms = newPerms
-
         # Package Votes into vote Object
         retVote = Vote()
         for job, finalVote in enumerate(votes):
@@ -394,8 +369,7 @@ class Robot:
         self.jobQueue.append(job)
 
     def assignFakeJob(self, job, dist):
-        fakeJob = Job(job.startX, job.startY, job.endX, job.endY,
-                      job.activationTime, job.assigned, True)
+        fakeJob = replace(job, fake=True)
         self.jobQueue.append(fakeJob)
         self.stats.conflicts += 1
         self.stats.utilityLost += dist
@@ -403,84 +377,132 @@ class Robot:
     def move(self):
         """Moves the robot happily along the path destroying all in its wake"""
         if self.path:
-            x, y = self.path.pop(0)
-            self.stats.distanceTraveled += 1
+            if self.reservations is not None and not self.reservations.isClear(self.name, *self.path[0]):
+                # Another robot has the next cell, so find a new way to the same place from here
+                self.stats.replans += 1
+                self.path = self.planPath(self.x, self.y, *self.path[-1])
+            x, y = self.path.advance()
+            if self.reservations is not None and self.reservations.isWaiting(self.name, self.x, self.y, x, y):
+                self.stats.waitTicks += 1
+            else:
+                self.stats.distanceTraveled += 1
             self.x = x
             self.y = y
+            if self.spatialIndex is not None:
+                self.spatialIndex.move(self, x, y)
 
-    def getRobotRankedVotes(self, jobList):
-        votes = [0 for i in range(len(jobList))]
-        numCount = {
-            0: 0,
-            1: 0,
-            2: 0,
-            3: 0,
-        }
-        votingWeights = []
-        for job in jobList:
-            # get distance to job
-            distanceToStart = math.sqrt(
-                (self.x - job.startX)**2 + (self.y - job.startY)**2)
-            # Check if distance is closer than X
-            if distanceToStart < 50:
-                # Check if distance is very close
-                if distanceToStart < 25:
-                    # Check to see if can finish the job without having to charge
-                    if self.batteryPercent > distanceToStart:
-                        votingWeights.append(3)
-                        numCount[3] += 1
-                    else:
-                        votingWeights.append(2)
-                        numCount[2] += 1
-                else:
-                    votingWeights.append(1)
-                    numCount[1] += 1
+    def fastForward(self, limit, apply=True):
+        """
+            Advances the robot through as many of the next `limit` ticks as it can before it has to make a decision
+            (finish charging, finish or start a job, or head to a charger) and returns how many ticks that was.
+            Those ticks give exactly the same result as calling update for each of them. With apply set to false
+            the robot is left untouched and only the number of ticks is returned
+        """
+        chargeX, chargeY = self.chargingPoint[1], self.chargingPoint[0]
+        x, y = self.x, self.y
+        battery = self.batteryPercent
+        needCharge = self.needCharge
+        path = self.path
+        step = 0
+        jobEnd = None
+        if self.jobStatus == self.JOB_IN_PROGRESS and self.jobQueue:
+            jobEnd = (self.jobQueue[0].endX, self.jobQueue[0].endY)
+        # Robots with a job to start, or waiting at the start of one, get going as soon as they don't need a charge
+        waitingOnJob = (self.jobStatus == self.JOB_UNASSIGNED and len(self.jobQueue) > 0) or self.jobStatus == self.JOB_STARTED
+        powerConsumed = timeCharging = distanceTraveled = 0
+        ticks = 0
+
+        def mustDecide(battery, needCharge, atCharger, walking):
+            """Mirrors updateCharging, evaluateJobProgress and getPath for one tick"""
+            if battery > self.getCostToChargeStation(x, y) and battery >= self.MAX_CHARGE and needCharge:
+                return True
+            if (x, y) == jobEnd:
+                return True
+            if needCharge:
+                return not self.chargingPath and not atCharger
+            return (self.jobStatus == self.JOB_UNASSIGNED and len(self.jobQueue) > 0) or \
+                (self.jobStatus == self.JOB_STARTED and not walking)
+
+        # Walk the path one tick at a time, the cost of getting back to the charger changes with every step
+        while step < len(path) and ticks < limit:
+            atCharger = x == chargeX and y == chargeY
+            if atCharger and battery < self.MAX_CHARGE:
+                newBattery = min(battery + 15, self.MAX_CHARGE)
             else:
-                votingWeights.append(0)
-        if (numCount[1] == len(jobList)):
-            return [1 for i in range(len(jobList))]
-
-        for idx, vote in enumerate(votingWeights):
-            if vote == 3:
-                if numCount[3] > 1:
-                    votes[idx] = len(jobList)/numCount[3]
-                else:
-                    votes[idx] = len(jobList)
-
-                    return votes
-            elif vote == 2 and numCount[3] == 0:
-                if numCount[2] > 1:
-                    votes[idx] = len(jobList)/numCount[2]
-                else:
-                    votes[idx] = len(jobList)
-
-                    return votes
-            elif vote == 1 and numCount[3] == 0 and numCount[2] == 0:
-                if numCount[1] > 1:
-                    votes[idx] = len(jobList)/numCount[1]
+                newBattery = battery - self.BATTERY_MOVE_COST
+            newNeedCharge = needCharge or newBattery <= self.getCostToChargeStation(x, y)
+            if mustDecide(newBattery, newNeedCharge, atCharger, True):
+                break
+            if newBattery > battery:
+                timeCharging += 1
+            else:
+                powerConsumed += self.BATTERY_MOVE_COST
+            battery, needCharge = newBattery, newNeedCharge
+            x, y = path[step]
+            step += 1
+            distanceTraveled += 1
+            ticks += 1
+
+        # Standing still, so the cost of getting back to the charger stays the same
+        atCharger = x == chargeX and y == chargeY
+        cost = self.getCostToChargeStation(x, y)
+        if step == len(path) and ticks < limit and not ((x, y) == jobEnd or
+                                                         (needCharge and not self.chargingPath and not atCharger) or
+                                                         (not needCharge and waitingOnJob)):
+            if not atCharger:
+                # Battery drains by one every tick until it drops to the cost of getting back to the charger, which is
+                # a decision unless the robot is already set on charging
+                if needCharge and battery - 1 > cost and battery - 1 >= self.MAX_CHARGE:
+                    skip = 0
+                elif needCharge or self.chargingPath:
+                    skip = limit - ticks
                 else:
-                    votes[idx] = len(jobList)
-
-                    return votes
+                    skip = min(max(battery - cost, 1) - 1, limit - ticks)
+                battery -= skip
+                powerConsumed += skip
+                needCharge = needCharge or (skip > 0 and battery <= cost)
+                ticks += skip
+            else:
+                # Charge up one tick at a time, charging only takes a few dozen ticks
+                while ticks < limit and (battery < self.MAX_CHARGE or needCharge):
+                    newBattery = min(battery + 15, self.MAX_CHARGE) if battery < self.MAX_CHARGE \
+                        else battery - self.BATTERY_IDLE_COST
+                    newNeedCharge = needCharge or newBattery <= cost
+                    if mustDecide(newBattery, newNeedCharge, True, False):
+                        break
+                    if newBattery > battery:
+                        timeCharging += 1
+                    else:
+                        powerConsumed += self.BATTERY_IDLE_COST
+                    battery, needCharge = newBattery, newNeedCharge
+                    ticks += 1
+                # Fully charged and not waiting on it, so it alternates between idling and topping up
+                if ticks < limit and battery >= self.MAX_CHARGE and not needCharge:
+                    skip = limit - ticks
+                    powerConsumed += (skip + 1) // 2
+                    timeCharging += skip // 2
+                    battery = self.MAX_CHARGE - skip % 2
+                    ticks += skip
+
+        if apply and ticks > 0:
+            self.x, self.y = x, y
+            if self.spatialIndex is not None:
+                self.spatialIndex.move(self, x, y)
+            self.batteryPercent = battery
+            self.needCharge = needCharge
+            self.path = path[step:]
+            self.stats.powerConsumed += powerConsumed
+            self.stats.timeCharging += timeCharging
+            self.stats.distanceTraveled += distanceTraveled
+        return ticks
 
-        return votes
+    def getRobotRankedVotes(self, jobList):
+        """Ranked votes for the jobs from this robot alone, see votingEngine.rankedVotes"""
+        return rankedVotes(distanceMatrix([self], jobList), np.array([self.batteryPercent]))[0].tolist()
 
     def getBordaStyleVotes(self, jobList):
-        votes = [0 for i in range(len(jobList))]
-        distances = []
-        sorted = []
-        for job in jobList:
-            distances.append(math.sqrt(
-                (self.x - job.startX)**2 + (self.y - job.startY)**2))
-            sorted.append(math.sqrt(
-                (self.x - job.startX)**2 + (self.y - job.startY)**2))
-        sorted.sort()
-        for i, num in enumerate(sorted):
-            idx = distances.index(num)
-            votes[idx] = len(jobList) - i
-            distances[idx] = 100000
-
-        return votes
+        """Borda count votes for the jobs from this robot alone, see votingEngine.bordaVotes"""
+        return bordaVotes(distanceMatrix([self], jobList))[0].tolist()
 
 
 class Vote:
@@ -490,16 +512,3 @@ class Vote:
     def addVote(self, job, vote):
         self.jobVotes.append({"job": job, "vote": vote})
 
-
-@dataclass
-class Job:
-    startX: int
-    startY: int
-    endX: int
-    endY: int
-    activationTime: int
-    assigned: bool
-    fake: bool
-
-    def __hash__(self):
-        return hash(self.startX) * 7 + hash(self.startY) * 13 + 7 * hash(self.fake)
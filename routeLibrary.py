@@ -0,0 +1,63 @@
+import constants
+from pathEngine import Path
+
+
+class RouteLibrary:
+    """
+        Memoised paths between stations. Jobs always start and end at job stations and robots only ever charge at
+        charging stations, so the same routes get planned over and over. Each route between two stations is
+        searched for once, frozen into a read-only buffer and handed out as a new Path over that buffer, so every
+        robot on the route walks the same cells with its own cursor and nothing is copied. Anything that doesn't
+        start and end at a station goes straight to the path engine.
+
+        Stands in for the path engine, robots call findPath on it the same way
+    """
+
+    def __init__(self, pathEngine):
+        self.pathEngine = pathEngine
+        self.grid = pathEngine.grid
+        self.stations = [index for index, cell in enumerate(self.grid.cells)
+                         if cell in (constants.CHARGING_STATION, constants.JOB_STATION)]
+        self.isStation = set(self.stations)
+        self.routes = {}
+        # How many of the routes are already saved in a MapCache
+        self.saved = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.routes)
+
+    def findPath(self, startX, startY, endX, endY):
+        """Returns the path from (startX, startY) to (endX, endY), shared with every other robot taking it"""
+        width = self.grid.width
+        start = startY * width + startX
+        end = endY * width + endX
+        if start not in self.isStation or end not in self.isStation:
+            return self.pathEngine.findPath(startX, startY, endX, endY)
+        cells = self.routes.get((start, end))
+        if cells is None:
+            self.misses += 1
+            cells = self.freeze(self.pathEngine.findPath(startX, startY, endX, endY))
+            self.routes[(start, end)] = cells
+        else:
+            self.hits += 1
+        return Path(cells, width)
+
+    def freeze(self, path):
+        """Read-only copy of the path's cells that every Path on the route can share"""
+        return memoryview(path.remainingCells().tobytes()).cast('i')
+
+    def precompute(self):
+        """Plans every route between two stations up front instead of the first time a robot asks for it"""
+        width = self.grid.width
+        for start in self.stations:
+            for end in self.stations:
+                if start != end and (start, end) not in self.routes:
+                    self.routes[(start, end)] = self.freeze(
+                        self.pathEngine.findPath(start % width, start // width, end % width, end // width))
+
+    def printReport(self):
+        lookups = self.hits + self.misses
+        print(f"    Route Library: {len(self.routes)} routes, {self.hits} shared, {self.misses} planned "
+              f"({self.hits / lookups if lookups else 0:.0%} shared)")
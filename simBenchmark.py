@@ -0,0 +1,131 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+import mapRegistry
+import warehouseSimulator
+from batchRunner import printTable
+from pathBenchmark import tileWarehouse
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak memory is left out there
+    resource = None
+
+
+MODES = ['a', 'b', 'c', 'd', 'e', 'f']
+COLUMNS = ["mode", "warehouse", "tile", "size", "robots", "ticks", "setupSeconds", "wallSeconds", "ticksPerSecond",
+           "pathSearches", "nodesExpanded", "peakMemoryMB", "jobsCompleted", "finished"]
+
+
+def runCase(case):
+    """
+        Runs one headless simulation and measures it. Each case gets a fresh worker process, so the peak memory is
+        for that case alone
+    """
+    mode, warehouse, tile, seed, maxTicks, options = case
+    layout = tileWarehouse(mapRegistry.loadMap(warehouse), tile)
+    random.seed(f"{seed}:{mode}:{warehouse}:{tile}")
+    start = time.perf_counter()
+    simulation = warehouseSimulator.WarehouseSimulator(0, mode, False, False, 1, layout, **options)
+    setupTime = time.perf_counter() - start
+    start = time.perf_counter()
+    simulation.run(report=False, maxTicks=maxTicks)
+    wallTime = time.perf_counter() - start
+
+    pathSearches = simulation.pathEngine.searches
+    nodesExpanded = simulation.pathEngine.expanded
+    lengthEngine = simulation.distanceCache.pathEngine
+    if lengthEngine is not simulation.pathEngine:
+        pathSearches += lengthEngine.searches
+        nodesExpanded += lengthEngine.expanded
+    return {
+        "mode": mode,
+        "warehouse": warehouse,
+        "tile": tile,
+        "size": f"{simulation.grid.width}x{simulation.grid.height}",
+        "robots": len(simulation.chargingStations),
+        "ticks": simulation.stats.ticks,
+        "setupSeconds": round(setupTime, 4),
+        "wallSeconds": round(wallTime, 4),
+        "ticksPerSecond": round(simulation.stats.ticks / wallTime, 1),
+        "pathSearches": pathSearches,
+        "nodesExpanded": nodesExpanded,
+        # ru_maxrss is in kilobytes on Linux
+        "peakMemoryMB": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None,
+        "jobsCompleted": simulation.stats.getJobsCompleted(),
+        "finished": simulation.finished,
+    }
+
+
+def findRegressions(results, baseline, tolerance):
+    """Returns a message for every case that runs more than tolerance slower than in the baseline results"""
+    # Older baselines numbered the warehouses with ints
+    previous = {(row["mode"], str(row["warehouse"]), row["tile"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["mode"], row["warehouse"], row["tile"]))
+        if old and row["ticksPerSecond"] < old["ticksPerSecond"] * (1 - tolerance):
+            regressions.append(f"mode {row['mode']} warehouse {row['warehouse']} tile {row['tile']}: "
+                               f"{row['ticksPerSecond']} ticks/s, was {old['ticksPerSecond']}")
+    return regressions
+
+
+def main():
+    """
+        Runs every mode on every warehouse, and on bigger copies of them, with a fixed seed and records how fast the
+        simulator gets through them
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-m", "--modes", type=str, nargs='+', choices=MODES, default=MODES, help="Simulation modes to run")
+    parser.add_argument("-w", "--warehouses", type=str, nargs='+', default=[str(number) for number in range(len(mapRegistry.MAPS))],
+                        help="Warehouses to run the modes on, by number, name or path like main.py -w")
+    parser.add_argument("-t", "--tiles", type=int, nargs='+', default=[1, 2],
+                        help="Also run on each warehouse repeated this many times in both directions")
+    parser.add_argument("-s", "--seed", type=int, default=1337, help="Seed for every run")
+    parser.add_argument("--max-ticks", type=int, default=5000,
+                        help="Cut runs short after this many ticks. On big maps some jobs need more battery than a "
+                             "robot holds, and the robot stuck with one never lets the run finish")
+    parser.add_argument("-e", "--engine", type=str, choices=['object', 'vector'], default='object',
+                        help="Simulation core to use")
+    parser.add_argument("-p", "--planner", type=str, choices=list(warehouseSimulator.PLANNERS), default='astar',
+                        help="Path planner robots use")
+    parser.add_argument("-ff", "--fast-forward", action="store_true", default=False,
+                        help="Skip over ticks where nothing but batteries and positions change")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Number of cases to run at once, more than one makes the timings noisier")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Write the results to this JSON file")
+    parser.add_argument("-b", "--baseline", type=str, default=None,
+                        help="JSON file from an earlier run to compare ticks per second against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="How much slower than the baseline a case can be before it counts as a regression")
+    args = parser.parse_args()
+
+    options = {"engine": args.engine, "planner": args.planner, "fastForward": args.fast_forward}
+    cases = [(mode, warehouse, tile, args.seed, args.max_ticks, options)
+             for tile, warehouse, mode in itertools.product(args.tiles, args.warehouses, args.modes)]
+    # One case per task and a new worker for every task, so each case starts in a process of its own
+    with multiprocessing.Pool(args.workers, maxtasksperchild=1) as pool:
+        results = pool.map(runCase, cases, chunksize=1)
+    printTable(results, COLUMNS)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"seed": args.seed, "options": options, "python": sys.version.split()[0], "results": results},
+                      file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = findRegressions(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import random
+from array import array
+import numpy as np
+from jobStore import Job
+from pathEngine import Path
+from statisticManager import StatsObject
+
+
+# Bumped whenever the layout below changes, older snapshots are refused rather than misread
+SNAPSHOT_VERSION = 1
+ROBOT_COLUMNS = {"x": np.int32, "y": np.int32, "batteryPercent": np.int32, "jobStatus": np.int8,
+                 "needCharge": np.bool_, "chargingPath": np.bool_}
+JOB_COLUMNS = {"startX": np.int32, "startY": np.int32, "endX": np.int32, "endY": np.int32,
+               "activationTime": np.int64, "assigned": np.bool_, "fake": np.bool_, "id": np.int64}
+STATS_COLUMNS = {name: np.float64 if name == "utilityLost" else np.int64 for name in vars(StatsObject())}
+
+
+def writeSnapshot(simulation, path):
+    """
+        Writes the state of the simulation between two ticks to path as an uncompressed .npz of plain arrays: the
+        robots (position, battery, flags, the rest of their path and their job queues), every job in the job store
+        along with its pending and available order, each robot's statistics, the random module's state and the
+        tick and iteration it was taken at. Caches and path engines aren't saved, they rebuild themselves
+    """
+    if simulation.reservations:
+        raise ValueError("Snapshots don't include path reservations")
+    if simulation.vectorEngine:
+        # Counts still sitting in the engine's arrays belong in the StatsObjects
+        simulation.vectorEngine.flushStats()
+    robots = simulation.robots
+    jobStore = simulation.jobStore
+    arrays = {
+        "version": np.array([SNAPSHOT_VERSION]),
+        "grid": np.frombuffer(simulation.grid.cells, dtype=np.uint8).reshape(simulation.grid.height, simulation.grid.width),
+        "tick": np.array([simulation.tick, simulation.iteration], dtype=np.int64),
+    }
+
+    # random.getstate() is (version, 625 words of Mersenne Twister state, cached gauss value or None)
+    version, words, gauss = random.getstate()
+    arrays["rngState"] = np.array((version,) + words, dtype=np.int64)
+    arrays["rngGauss"] = np.array([] if gauss is None else [gauss], dtype=np.float64)
+
+    for name, dtype in ROBOT_COLUMNS.items():
+        arrays[f"robot.{name}"] = np.array([getattr(robot, name) for robot in robots], dtype=dtype)
+    # Paths and job queues differ in length between robots, so they are stored end to end with offsets
+    paths = [robot.path.remainingCells() for robot in robots]
+    arrays["robot.pathOffsets"] = np.cumsum([0] + [len(cells) for cells in paths], dtype=np.int64)
+    arrays["robot.pathCells"] = np.concatenate([np.array(cells, dtype=np.int64) for cells in paths] + [np.zeros(0, dtype=np.int64)])
+    arrays["robot.queueOffsets"] = np.cumsum([0] + [len(robot.jobQueue) for robot in robots], dtype=np.int64)
+    queued = [job for robot in robots for job in robot.jobQueue]
+    # Real jobs are shared with the job store and go by id, fake ones are each robot's own copy so go in whole
+    for name, dtype in JOB_COLUMNS.items():
+        arrays[f"queue.{name}"] = np.array([getattr(job, name) for job in queued], dtype=dtype)
+    currentJobs = []
+    for robot in robots:
+        if robot.currentJob is None:
+            currentJobs.append(-1)
+        elif robot.jobQueue and robot.jobQueue[0] is robot.currentJob:
+            currentJobs.append(0)
+        else:
+            raise ValueError(f"Robot {robot.name} is working on a job that isn't at the front of its queue")
+    arrays["robot.currentJob"] = np.array(currentJobs, dtype=np.int8)
+
+    for name, dtype in JOB_COLUMNS.items():
+        arrays[f"job.{name}"] = np.array([getattr(job, name) for job in jobStore.jobs], dtype=dtype)
+    # The pending heap is kept in heap order and the available jobs in the order they will be handed out
+    arrays["jobStore.pending"] = np.array(jobStore.pending, dtype=np.int64).reshape(-1, 2)
+    arrays["jobStore.available"] = np.array(list(jobStore.available), dtype=np.int64)
+
+    for name, dtype in STATS_COLUMNS.items():
+        arrays[f"stats.{name}"] = np.array([getattr(stats, name) for stats in simulation.stats.stats], dtype=dtype)
+
+    with open(path, "wb") as file:
+        np.savez(file, **arrays)
+
+
+def readSnapshot(simulation, path):
+    """
+        Puts a simulation built for the same warehouse into the state saved in path by writeSnapshot. The mode,
+        engine and planner are whatever the simulation was built with, so one snapshot can be carried on in any
+        of them
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    if arrays["version"][0] != SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot {path} is version {arrays['version'][0]}, only version {SNAPSHOT_VERSION} can be read")
+    if arrays["grid"].shape != (simulation.grid.height, simulation.grid.width) or \
+            arrays["grid"].tobytes() != simulation.grid.cells:
+        raise ValueError(f"Snapshot {path} was taken in a different warehouse")
+    if simulation.reservations:
+        raise ValueError("Snapshots don't include path reservations")
+
+    simulation.tick, simulation.iteration = arrays["tick"].tolist()
+
+    jobStore = simulation.jobStore
+    jobStore.jobs = [Job(*values) for values in zip(*(arrays[f"job.{name}"].tolist() for name in JOB_COLUMNS))]
+    jobStore.pending = [tuple(entry) for entry in arrays["jobStore.pending"].tolist()]
+    jobStore.available = {jobId: jobStore.jobs[jobId] for jobId in arrays["jobStore.available"].tolist()}
+
+    for name in STATS_COLUMNS:
+        for stats, value in zip(simulation.stats.stats, arrays[f"stats.{name}"].tolist()):
+            setattr(stats, name, value)
+
+    # Fresh robots pick up the restored job store, then get their saved state
+    simulation.robots = simulation.getRobots()
+    if len(simulation.robots) != len(arrays["robot.x"]):
+        raise ValueError(f"Snapshot {path} has {len(arrays['robot.x'])} robots, the warehouse has {len(simulation.robots)}")
+    queued = [Job(*values) for values in zip(*(arrays[f"queue.{name}"].tolist() for name in JOB_COLUMNS))]
+    queued = [job if job.fake else jobStore.jobs[job.id] for job in queued]
+    pathOffsets = arrays["robot.pathOffsets"].tolist()
+    queueOffsets = arrays["robot.queueOffsets"].tolist()
+    currentJobs = arrays["robot.currentJob"].tolist()
+    # Making the robots drew their battery levels, so the random module goes back after that
+    rngState = arrays["rngState"].tolist()
+    gauss = arrays["rngGauss"].tolist()
+    random.setstate((rngState[0], tuple(rngState[1:]), gauss[0] if gauss else None))
+    for index, robot in enumerate(simulation.robots):
+        for name in ROBOT_COLUMNS:
+            setattr(robot, name, arrays[f"robot.{name}"][index].item())
+        if robot.spatialIndex is not None:
+            robot.spatialIndex.move(robot, robot.x, robot.y)
+        cells = arrays["robot.pathCells"][pathOffsets[index]:pathOffsets[index + 1]]
+        robot.path = Path(array('i', cells.tolist()), simulation.grid.width)
+        robot.jobQueue = queued[queueOffsets[index]:queueOffsets[index + 1]]
+        robot.currentJob = robot.jobQueue[0] if currentJobs[index] == 0 else None
@@ -0,0 +1,96 @@
+import math
+
+
+class SpatialIndex:
+    """
+        Grid of buckets over the warehouse that keeps track of which robots are where, so proximity questions only
+        look at the buckets near the point asked about instead of every robot. Buckets are bucketSize cells on a
+        side and robots are moved between them as they move, which is O(1).
+
+        Answers radius queries by straight line distance, and k-nearest queries that can rank robots by a more
+        expensive distance (like path length) as long as it is never shorter than the manhattan distance
+    """
+
+    def __init__(self, width, height, bucketSize=8):
+        self.bucketSize = bucketSize
+        self.bucketsWide = math.ceil(width / bucketSize)
+        self.bucketsHigh = math.ceil(height / bucketSize)
+        self.buckets = {}
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def bucket(self, x, y):
+        return x // self.bucketSize, y // self.bucketSize
+
+    def add(self, robot):
+        self.positions[robot] = (robot.x, robot.y)
+        self.buckets.setdefault(self.bucket(robot.x, robot.y), set()).add(robot)
+
+    def remove(self, robot):
+        x, y = self.positions.pop(robot)
+        self.buckets[self.bucket(x, y)].discard(robot)
+
+    def move(self, robot, x, y):
+        """Records that the robot is now at (x, y)"""
+        oldX, oldY = self.positions[robot]
+        self.positions[robot] = (x, y)
+        oldBucket, newBucket = self.bucket(oldX, oldY), self.bucket(x, y)
+        if oldBucket != newBucket:
+            self.buckets[oldBucket].discard(robot)
+            self.buckets.setdefault(newBucket, set()).add(robot)
+
+    def inRadius(self, x, y, radius):
+        """Returns the robots no further than radius from (x, y) in a straight line"""
+        low = self.bucket(max(x - radius, 0), max(y - radius, 0))
+        high = self.bucket(int(x + radius), int(y + radius))
+        found = []
+        for bucketX in range(int(low[0]), min(high[0], self.bucketsWide - 1) + 1):
+            for bucketY in range(int(low[1]), min(high[1], self.bucketsHigh - 1) + 1):
+                for robot in self.buckets.get((bucketX, bucketY), ()):
+                    robotX, robotY = self.positions[robot]
+                    if (robotX - x) ** 2 + (robotY - y) ** 2 <= radius ** 2:
+                        found.append(robot)
+        return found
+
+    def rings(self, x, y):
+        """
+            Yields the robots in square rings of buckets around the one holding (x, y), nearest ring first, along
+            with the smallest manhattan distance any cell in the ring can be from (x, y)
+        """
+        centerX, centerY = self.bucket(x, y)
+        maxRing = max(centerX, self.bucketsWide - 1 - centerX, centerY, self.bucketsHigh - 1 - centerY)
+        for ring in range(maxRing + 1):
+            robots = []
+            for bucketX in range(centerX - ring, centerX + ring + 1):
+                # Only the edges of the square are in this ring
+                step = 1 if abs(bucketX - centerX) == ring else 2 * ring
+                for bucketY in range(centerY - ring, centerY + ring + 1, max(step, 1)):
+                    robots.extend(self.buckets.get((bucketX, bucketY), ()))
+            yield (ring - 1) * self.bucketSize + 1 if ring else 0, robots
+
+    def nearest(self, x, y, k, distances=None, include=None, tiebreak=None):
+        """
+            Returns up to k (robot, distance) pairs for the robots closest to (x, y), closest first. distances maps
+            a list of robots to how far away each one is, one ring of buckets at a time, and defaults to the
+            manhattan distance; it must never be less than that. include filters which robots count, and equally
+            distant robots are ordered by tiebreak. Rings keep being searched until they can't hold anything as
+            close as the k-th robot found so far, so ties with it are always found too
+        """
+        if k <= 0:
+            return []
+        if distances is None:
+            distances = lambda robots: [abs(self.positions[robot][0] - x) + abs(self.positions[robot][1] - y)
+                                        for robot in robots]
+        found = []
+        for lowerBound, robots in self.rings(x, y):
+            if len(found) >= k and lowerBound > found[k - 1][0]:
+                break
+            robots = [robot for robot in robots if include is None or include(robot)]
+            if not robots:
+                continue
+            for robot, distance in zip(robots, distances(robots)):
+                found.append((distance, tiebreak(robot) if tiebreak else 0, robot))
+            found.sort(key=lambda entry: entry[:2])
+        return [(robot, robotDistance) for robotDistance, _, robot in found[:k]]
@@ -28,6 +28,29 @@ class StatisticManager:
     def getUtilityLost(self):
         return sum([stat.utilityLost for stat in self.stats])
 
+    def getWaitTicks(self):
+        return sum([stat.waitTicks for stat in self.stats])
+
+    def getReplans(self):
+        return sum([stat.replans for stat in self.stats])
+
+    def getCongestion(self):
+        return sum([stat.congestion for stat in self.stats])
+
+    def getTotals(self):
+        return {
+            "ticks": self.getTimeTaken(),
+            "powerConsumed": self.getPowerConsumed(),
+            "distanceTraveled": self.getDistanceTraveled(),
+            "jobsCompleted": self.getJobsCompleted(),
+            "timeCharging": self.getTimeCharging(),
+            "conflicts": self.getConflicts(),
+            "utilityLost": self.getUtilityLost(),
+            "waitTicks": self.getWaitTicks(),
+            "replans": self.getReplans(),
+            "congestion": self.getCongestion(),
+        }
+
     def printReport(self):
         title = f"REPORT FOR RUN {self.name}:"
         print(title)
@@ -39,6 +62,11 @@ class StatisticManager:
         print(f"    Time Charging: {self.getTimeCharging():.2f}")
         print(f"    Conflicts: {self.getConflicts()}")
         print(f"    Utility Lost: {self.getUtilityLost():.2f}")
+        # Only robots planning around each other count these, without that the report stays as it always was
+        if self.getWaitTicks() or self.getReplans() or self.getCongestion():
+            print(f"    Wait Ticks: {self.getWaitTicks()}")
+            print(f"    Replans: {self.getReplans()}")
+            print(f"    Congested Plans: {self.getCongestion()}")
 
 
 
@@ -50,4 +78,9 @@ class StatsObject:
         self.timeCharging = 0
         self.conflicts = 0
         self.utilityLost = 0
+        # Only counted when robots plan around each other: ticks spent waiting for a cell to clear, paths thrown
+        # away because another robot got in the way, and plans that came out longer than the uncontested path
+        self.waitTicks = 0
+        self.replans = 0
+        self.congestion = 0
 
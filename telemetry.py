@@ -0,0 +1,89 @@
+import glob
+import os
+import numpy as np
+
+
+class TelemetrySink:
+    """
+        Streams the state of the simulation after every tick to disk as NumPy .npy files, one file per column per
+        chunk of ticks. Records go into preallocated arrays (one row per tick, one column per robot for robot
+        state), and once chunkTicks rows have been filled the chunk is written out and the arrays are reused, so
+        memory stays the same however long the run is.
+
+        Per tick columns are tick, iteration, availableJobs (active jobs still waiting for a robot) and conflicts
+        (total so far). Per robot columns are x, y, battery, jobStatus, queueLength and needCharge. Load them back
+        with loadTelemetry. Ticks skipped by fast forwarding aren't recorded, the tick column shows the gaps
+    """
+    TICK_COLUMNS = {"tick": np.int64, "iteration": np.int32, "availableJobs": np.int32, "conflicts": np.int64}
+    ROBOT_COLUMNS = {"x": np.int32, "y": np.int32, "battery": np.int32, "jobStatus": np.int8,
+                     "queueLength": np.int32, "needCharge": np.bool_}
+
+    def __init__(self, directory, numRobots, chunkTicks=4096):
+        self.directory = directory
+        self.numRobots = numRobots
+        self.chunkTicks = chunkTicks
+        os.makedirs(directory, exist_ok=True)
+        # Chunks left over from an earlier run would get mixed in when loading
+        for name in list(self.TICK_COLUMNS) + list(self.ROBOT_COLUMNS):
+            for path in glob.glob(os.path.join(directory, f"{name}.*.npy")):
+                os.remove(path)
+        self.columns = {name: np.zeros(chunkTicks, dtype=dtype) for name, dtype in self.TICK_COLUMNS.items()}
+        self.columns.update({name: np.zeros((chunkTicks, numRobots), dtype=dtype)
+                             for name, dtype in self.ROBOT_COLUMNS.items()})
+        self.row = 0
+        self.chunk = 0
+
+    def record(self, tick, iteration, robots, jobStore, stats, vectorEngine=None):
+        """Adds a row with the state of the simulation after the given tick"""
+        row = self.row
+        columns = self.columns
+        columns["tick"][row] = tick
+        columns["iteration"][row] = iteration
+        # Assigned jobs are only dropped from the index the next time it is asked for them
+        columns["availableJobs"][row] = sum(not job.assigned for job in jobStore.available.values())
+        columns["conflicts"][row] = stats.getConflicts()
+        if vectorEngine:
+            # Robot state already lives in arrays, copy them across whole
+            columns["x"][row] = vectorEngine.x
+            columns["y"][row] = vectorEngine.y
+            columns["battery"][row] = vectorEngine.battery
+            columns["jobStatus"][row] = vectorEngine.jobStatus
+            columns["needCharge"][row] = vectorEngine.needCharge
+        else:
+            for index, robot in enumerate(robots):
+                columns["x"][row, index] = robot.x
+                columns["y"][row, index] = robot.y
+                columns["battery"][row, index] = robot.batteryPercent
+                columns["jobStatus"][row, index] = robot.jobStatus
+                columns["needCharge"][row, index] = robot.needCharge
+        for index, robot in enumerate(robots):
+            columns["queueLength"][row, index] = len(robot.jobQueue)
+        self.row += 1
+        if self.row == self.chunkTicks:
+            self.flush()
+
+    def flush(self):
+        """Writes out the rows recorded since the last flush as a new chunk"""
+        if self.row == 0:
+            return
+        for name, values in self.columns.items():
+            np.save(os.path.join(self.directory, f"{name}.{self.chunk:05d}.npy"), values[:self.row])
+        self.row = 0
+        self.chunk += 1
+
+
+def loadTelemetry(directory):
+    """
+        Reads every chunk a TelemetrySink wrote to the directory back into one array per column. A directory with
+        no chunks in it, like one from a run that never got through a tick, gives empty columns
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"There is no telemetry directory at {directory}")
+    columns = {}
+    for name, dtype in list(TelemetrySink.TICK_COLUMNS.items()) + list(TelemetrySink.ROBOT_COLUMNS.items()):
+        chunks = [np.load(path) for path in sorted(glob.glob(os.path.join(directory, f"{name}.*.npy")))]
+        if chunks:
+            columns[name] = np.concatenate(chunks)
+        else:
+            columns[name] = np.zeros(0 if name in TelemetrySink.TICK_COLUMNS else (0, 0), dtype=dtype)
+    return columns
@@ -0,0 +1,15 @@
+import csv
+import batchRunner
+
+
+def test_writeResults(tmp_path):
+    """Every total a run reports ends up in the CSV"""
+    totals = batchRunner.runTask(('a', "0", 1337, 0, 'object', None))
+    rows = [{"mode": 'a', "warehouse": "0", "seed": 1337, "iteration": 0, **totals}]
+    path = tmp_path / "results.csv"
+    batchRunner.writeResults(rows, str(path))
+
+    with open(path, newline="") as file:
+        written = list(csv.DictReader(file))
+    assert list(written[0]) == batchRunner.KEYS + batchRunner.COLUMNS
+    assert all(float(written[0][key]) == totals[key] for key in totals)
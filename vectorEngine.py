@@ -0,0 +1,181 @@
+import numpy as np
+from robot import Robot
+from pathEngine import Path
+
+
+def stateProperty(name):
+    """Attribute that reads and writes the robot's slot in one of the engine's arrays"""
+    def get(self):
+        return getattr(self.engine, name)[self.index].item()
+
+    def set(self, value):
+        getattr(self.engine, name)[self.index] = value
+
+    return property(get, set)
+
+
+class VectorRobot(Robot):
+    """
+        Robot whose state lives in a VectorEngine's arrays instead of its own attributes. All of the decision making
+        is inherited from Robot, but the engine only calls it for robots that have something to decide; battery
+        updates, job completion checks and moves happen for every robot at once in the engine
+    """
+    x = stateProperty('x')
+    y = stateProperty('y')
+    batteryPercent = stateProperty('battery')
+    jobStatus = stateProperty('jobStatus')
+    needCharge = stateProperty('needCharge')
+    chargingPath = stateProperty('chargingPath')
+
+    def __init__(self, engine, index, *args):
+        self.engine = engine
+        self.index = index
+        super().__init__(*args)
+
+    @property
+    def path(self):
+        return self.engine.getPath(self.index)
+
+    @path.setter
+    def path(self, path):
+        self.engine.setPath(self.index, path)
+
+    def move(self):
+        self.engine.move(np.array([self.index]))
+
+
+class VectorEngine:
+    """
+        Struct-of-arrays simulation core. Robot state (position, battery, job status, charging flags and the path
+        being walked) is kept in NumPy arrays with one slot per robot, and each tick is applied to all robots with
+        array operations. Robots that need to make a decision that tick (finish charging, finish or start a job,
+        head to a charger) are handed to their VectorRobot methods one at a time, in the same order the object
+        engine would update them, so both engines produce the same results
+    """
+
+    def __init__(self, grid, distanceField, chargingStations):
+        count = len(chargingStations)
+        self.width = grid.width
+        self.indices = np.arange(count)
+        self.chargeX = np.array([station[1] for station in chargingStations], dtype=np.int64)
+        self.chargeY = np.array([station[0] for station in chargingStations], dtype=np.int64)
+        # Path lengths to each robot's own charger come from here, only for the robots that moved
+        self.distanceField = distanceField
+        self.robots = []
+        # SpatialIndex the robots are in, moved along with them
+        self.spatialIndex = None
+        self.reset()
+
+    def reset(self):
+        """Clears all robot state and statistics, ready for a new set of robots"""
+        count = len(self.indices)
+        self.x = np.zeros(count, dtype=np.int64)
+        self.y = np.zeros(count, dtype=np.int64)
+        self.battery = np.zeros(count, dtype=np.int64)
+        self.jobStatus = np.zeros(count, dtype=np.int8)
+        self.needCharge = np.zeros(count, dtype=bool)
+        self.chargingPath = np.zeros(count, dtype=bool)
+        # Paths are rows of packed cell indices (y * width + x) walked with a cursor
+        self.pathCells = np.zeros((count, 16), dtype=np.int64)
+        self.pathLength = np.zeros(count, dtype=np.int64)
+        self.pathCursor = np.zeros(count, dtype=np.int64)
+        # Statistics counted here until they are flushed into each robot's StatsObject
+        self.powerConsumed = np.zeros(count, dtype=np.int64)
+        self.timeCharging = np.zeros(count, dtype=np.int64)
+        self.distanceTraveled = np.zeros(count, dtype=np.int64)
+        # Path length from each robot's cell to its charger, and the cell it was looked up for
+        self.chargerLengths = np.zeros(count, dtype=np.int64)
+        self.chargerLengthCells = np.full(count, -1, dtype=np.int64)
+        self.robots = []
+
+    def getPath(self, index):
+        return Path(self.pathCells[index, self.pathCursor[index]:self.pathLength[index]].tolist(), self.width)
+
+    def setPath(self, index, path):
+        if len(path) > self.pathCells.shape[1]:
+            grown = np.zeros((len(self.indices), max(len(path), 2 * self.pathCells.shape[1])), dtype=np.int64)
+            grown[:, :self.pathCells.shape[1]] = self.pathCells
+            self.pathCells = grown
+        self.pathCells[index, :len(path)] = path.remainingCells()
+        self.pathLength[index] = len(path)
+        self.pathCursor[index] = 0
+
+    def update(self):
+        """
+            Runs one tick for every robot. Returns true if any robot still has jobs queued, like Robot.update
+        """
+        robots = self.robots
+        statuses = self.jobStatus
+        hasPath = self.pathCursor < self.pathLength
+
+        # Battery drain and charging, see Robot.updateCharging
+        cells = self.y * self.width + self.x
+        chargerLengths = self.chargerLengths
+        for index in np.flatnonzero(cells != self.chargerLengthCells).tolist():
+            chargerLengths[index] = self.distanceField.pathLength(
+                self.x[index].item(), self.y[index].item(), self.chargeX[index].item(), self.chargeY[index].item())
+        self.chargerLengthCells = cells
+        costToChargeStation = chargerLengths * Robot.BATTERY_MOVE_COST + Robot.BATTERY_MOVE_COST
+        atCharger = (self.x == self.chargeX) & (self.y == self.chargeY)
+        charging = atCharger & (self.battery < Robot.MAX_CHARGE)
+        moving = ~charging & hasPath
+        idle = ~charging & ~hasPath
+        self.battery[charging] = np.minimum(self.battery[charging] + 15, Robot.MAX_CHARGE)
+        self.timeCharging[charging] += 1
+        self.battery[moving] -= Robot.BATTERY_MOVE_COST
+        self.powerConsumed[moving] += Robot.BATTERY_MOVE_COST
+        self.battery[idle] -= Robot.BATTERY_IDLE_COST
+        self.powerConsumed[idle] += Robot.BATTERY_IDLE_COST
+        lowBattery = self.battery <= costToChargeStation
+        doneCharging = ~lowBattery & (self.battery >= Robot.MAX_CHARGE) & self.needCharge
+        self.needCharge[lowBattery] = True
+        self.needCharge[doneCharging] = False
+        self.chargingPath[doneCharging] = False
+
+        # Robots standing on the end of the job they are doing, see Robot.evaluateJobProgress
+        endX = np.full(len(robots), -1, dtype=np.int64)
+        endY = np.full(len(robots), -1, dtype=np.int64)
+        for index in np.flatnonzero(statuses == Robot.JOB_IN_PROGRESS).tolist():
+            if robots[index].jobQueue:
+                endX[index] = robots[index].jobQueue[0].endX
+                endY[index] = robots[index].jobQueue[0].endY
+        finishingJob = (statuses == Robot.JOB_IN_PROGRESS) & (self.x == endX) & (self.y == endY)
+
+        # Robots that need a new path, see Robot.getPath
+        queued = np.fromiter((len(robot.jobQueue) > 0 for robot in robots), dtype=bool, count=len(robots))
+        headingToCharge = self.needCharge & ~self.chargingPath & ~atCharger
+        startingJob = ~self.needCharge & (statuses == Robot.JOB_UNASSIGNED) & queued
+        startingPhaseTwo = ~self.needCharge & (statuses == Robot.JOB_STARTED) & ~hasPath
+
+        decisions = doneCharging | finishingJob | headingToCharge | startingJob | startingPhaseTwo
+        for index in np.flatnonzero(decisions).tolist():
+            robot = robots[index]
+            if doneCharging[index]:
+                robot.endCharging()
+            robot.evaluateJobProgress()
+            robot.getPath()
+
+        self.move(np.flatnonzero(self.pathCursor < self.pathLength))
+        return any(robot.jobQueue for robot in robots)
+
+    def move(self, indices):
+        """Moves the robots at the given indices one step along their paths, see Robot.move"""
+        indices = indices[self.pathCursor[indices] < self.pathLength[indices]]
+        cells = self.pathCells[indices, self.pathCursor[indices]]
+        self.x[indices] = cells % self.width
+        self.y[indices] = cells // self.width
+        self.pathCursor[indices] += 1
+        self.distanceTraveled[indices] += 1
+        if self.spatialIndex is not None:
+            for index in indices.tolist():
+                self.spatialIndex.move(self.robots[index], self.x[index].item(), self.y[index].item())
+
+    def flushStats(self):
+        """Adds the statistics counted since the last flush to each robot's StatsObject"""
+        for index, robot in enumerate(self.robots):
+            robot.stats.powerConsumed += self.powerConsumed[index].item()
+            robot.stats.timeCharging += self.timeCharging[index].item()
+            robot.stats.distanceTraveled += self.distanceTraveled[index].item()
+        self.powerConsumed[:] = 0
+        self.timeCharging[:] = 0
+        self.distanceTraveled[:] = 0
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def distanceMatrix(robots, jobs):
+    """Straight line distance from every robot to the start of every job, one row per robot"""
+    robotX = np.array([robot.x for robot in robots], dtype=np.int64)[:, None]
+    robotY = np.array([robot.y for robot in robots], dtype=np.int64)[:, None]
+    startX = np.array([job.startX for job in jobs], dtype=np.int64)[None, :]
+    startY = np.array([job.startY for job in jobs], dtype=np.int64)[None, :]
+    return np.sqrt(((robotX - startX) ** 2 + (robotY - startY) ** 2).astype(np.float64)).reshape(len(robots), len(jobs))
+
+
+def bordaVotes(distances):
+    """
+        Borda count for every robot at once: the closest job gets as many points as there are jobs, the next one
+        a point less and so on. Equally close jobs are ranked in job order, the stable sort keeps them that way
+    """
+    numJobs = distances.shape[1]
+    order = np.argsort(distances, axis=1, kind='stable')
+    votes = np.empty(distances.shape, dtype=np.int64)
+    np.put_along_axis(votes, order, np.broadcast_to(np.arange(numJobs, 0, -1), distances.shape), axis=1)
+    return votes
+
+
+def rankedVotes(distances, batteries):
+    """
+        Ranked votes for every robot at once. Jobs fall into classes by distance: 3 if closer than 25 and the
+        robot has more battery than the distance, 2 if closer than 25 otherwise, 1 if closer than 50 and 0 beyond
+        that. Each robot splits as many points as there are jobs evenly over the jobs in the best class it has,
+        and gives nothing to the rest
+    """
+    numRobots, numJobs = distances.shape
+    classes = np.where(distances < 25, np.where(batteries[:, None] > distances, 3, 2), np.where(distances < 50, 1, 0))
+    best = classes.max(axis=1, initial=0)
+    counts = (classes == best[:, None]).sum(axis=1)
+    share = numJobs / np.maximum(counts, 1)
+    return np.where((classes == best[:, None]) & (best[:, None] > 0), share[:, None], 0.0)
@@ -0,0 +1,92 @@
+import argparse
+import math
+import random
+import constants
+import mapRegistry
+
+
+def generateWarehouse(width, height, chargers, stationDensity=0.05, seed=None, rackDepth=2, rackLength=10, aisleWidth=2):
+    """
+        Builds a warehouse layout of the given size in the simulator's cell values. Chargers sit in rows along
+        the top, each row with an aisle under it. The rest of the floor is racks (walls) rackDepth deep and
+        rackLength long, with aisles aisleWidth wide between the rows of racks, cross aisles between racks in a
+        row and an aisle all the way around. About stationDensity of the aisle cells next to a rack become job
+        stations, picked with the seed. Every charger and station can reach every other
+    """
+    if width < 5 or height < 5:
+        raise ValueError("A warehouse needs to be at least 5x5")
+    if chargers < 1:
+        raise ValueError("A warehouse needs at least one charger")
+    if rackDepth < 1 or rackLength < 1:
+        raise ValueError("Racks need to be at least one cell deep and one cell long")
+    if aisleWidth < 1:
+        raise ValueError("Aisles need to be at least one cell wide")
+    if not 0 < stationDensity <= 1:
+        raise ValueError("The station density needs to be more than 0 and at most 1")
+    layout = [[constants.WALL] * width for _ in range(height)]
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            layout[y][x] = constants.FLOOR
+
+    # Charger rows alternate with aisles, chargers spread evenly over the rows
+    perRow = width - 2
+    chargerRows = math.ceil(chargers / perRow)
+    if 2 * chargerRows + rackDepth + 2 > height - 2:
+        raise ValueError(f"{chargers} chargers don't fit in a {width}x{height} warehouse")
+    for row in range(chargerRows):
+        count = chargers // chargerRows + (row < chargers % chargerRows)
+        for i in range(count):
+            layout[1 + 2 * row][1 + i * perRow // count] = constants.CHARGING_STATION
+
+    # Racks start below the charger rows and the aisle after them, and stop short of the bottom aisle
+    top = 2 * chargerRows + 2
+    y = top
+    while y + rackDepth <= height - 2:
+        x = 2
+        while x < width - 2:
+            for rackY in range(y, y + rackDepth):
+                for rackX in range(x, min(x + rackLength, width - 2)):
+                    layout[rackY][rackX] = constants.WALL
+            x += rackLength + aisleWidth
+        y += rackDepth + aisleWidth
+
+    # Job stations go in the aisles right in front of the racks
+    faces = [(x, y) for y in range(top - 1, height - 1) for x in range(1, width - 1)
+             if layout[y][x] == constants.FLOOR and
+             (layout[y - 1][x] == constants.WALL and y - 1 >= top or layout[y + 1][x] == constants.WALL and y + 1 < height - 1)]
+    if len(faces) < 2:
+        raise ValueError(f"A {width}x{height} warehouse has no room for racks to put job stations at")
+    rng = random.Random(seed)
+    for x, y in rng.sample(faces, max(2, round(stationDensity * len(faces)))):
+        layout[y][x] = constants.JOB_STATION
+    return layout
+
+
+def main():
+    """Generates a warehouse and saves it as a map main.py can load with -w"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("width", type=int, help="Width of the warehouse in cells")
+    parser.add_argument("height", type=int, help="Height of the warehouse in cells")
+    parser.add_argument("chargers", type=int, help="Number of charging stations, one robot each")
+    parser.add_argument("-d", "--station-density", type=float, default=0.05,
+                        help="Share of the cells in front of racks that are job stations")
+    parser.add_argument("-s", "--seed", type=int, default=1337, help="Seed for where job stations go")
+    parser.add_argument("--rack-depth", type=int, default=2, help="Rows in each rack")
+    parser.add_argument("--rack-length", type=int, default=10, help="Cells in each rack before a cross aisle")
+    parser.add_argument("--aisle-width", type=int, default=2, help="Width of the aisles between racks")
+    parser.add_argument("-o", "--output", type=str, required=True, help="File to save the map to, .csv or .wmap")
+    args = parser.parse_args()
+
+    try:
+        layout = generateWarehouse(args.width, args.height, args.chargers, args.station_density, args.seed,
+                                   args.rack_depth, args.rack_length, args.aisle_width)
+    except ValueError as error:
+        parser.error(str(error))
+    mapRegistry.saveMap(layout, args.output)
+    stations = sum(row.count(constants.JOB_STATION) for row in layout)
+    print(f"Saved a {args.width}x{args.height} warehouse with {args.chargers} chargers and {stations} job stations "
+          f"to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import constants
+
+
+class WarehouseGrid:
+    """
+        Read-only, array-backed copy of the warehouse layout. Cells are stored row by row in a single bytes
+        object holding the cell values, which double as movement weights (walls are 0 and can't be walked
+        on). One grid is built per simulation and shared by everything that needs to know where robots
+        can go
+    """
+
+    def __init__(self, warehouse):
+        self.width = len(warehouse[0])
+        self.height = len(warehouse)
+        self.cells = bytes(cell for row in warehouse for cell in row)
+        # Cheapest step anywhere in the warehouse, keeps distance heuristics admissible
+        self.minWeight = min((cell for cell in self.cells if cell != constants.WALL), default=1)
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def position(self, index):
+        return index % self.width, index // self.width
+
+    def weight(self, x, y):
+        return self.cells[y * self.width + x]
+
+    def walkable(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] != constants.WALL
+
+    def neighbors(self, index):
+        """Returns the indices of the walkable cells next to the cell at index, in up, right, down, left order"""
+        width = self.width
+        cells = self.cells
+        x = index % width
+        result = []
+        if index >= width and cells[index - width] != constants.WALL:
+            result.append(index - width)
+        if x < width - 1 and cells[index + 1] != constants.WALL:
+            result.append(index + 1)
+        if index + width < len(cells) and cells[index + width] != constants.WALL:
+            result.append(index + width)
+        if x > 0 and cells[index - 1] != constants.WALL:
+            result.append(index - 1)
+        return result
+
+    def connects(self, positions):
+        """Returns true if a robot can get from any of the (x, y) positions to all of the others"""
+        remaining = {self.index(x, y) for x, y in positions}
+        if not remaining:
+            return True
+        start = remaining.pop()
+        seen = {start}
+        frontier = [start]
+        for current in frontier:
+            for neighbor in self.neighbors(current):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+        return remaining <= seen
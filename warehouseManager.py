@@ -1,14 +1,22 @@
 import math
-from itertools import permutations
+import numpy as np
+from assignment import maximizeUtility
+from votingEngine import distanceMatrix, bordaVotes, rankedVotes
 
 
 MIN_UTIL = -1000
 
 
 class WarehouseManager:
-    def __init__(self, mode, verbose):
+    def __init__(self, mode, verbose, numVotes=3):
+        # The last preference is worth nothing, so with fewer than two there is nothing to vote with
+        if numVotes < 2:
+            raise ValueError("Robots need at least two votes")
         self.verbose = verbose
+        # SpatialIndex of the robots' positions, set by the simulator for each new set of robots
+        self.spatialIndex = None
         self.mode = mode
+        self.numVotes = numVotes
         self.efficiency = 0
         self.notifyAllRobots = False
 
@@ -38,9 +46,8 @@ class WarehouseManager:
         elif mode == 'f':
             self.updater = lambda x, y, z: self.notifyRobotsOfJobs(x, y, z)
 
-    def update(self, robots, jobList, totalTicks):
-        jobs = [job for job in jobList if totalTicks >=
-                job.activationTime and not job.assigned]
+    def update(self, robots, jobStore, totalTicks):
+        jobs = jobStore.getAvailable(totalTicks)
         if self.notifyAllRobots:
             freeRobots = robots
         else:
@@ -52,7 +59,7 @@ class WarehouseManager:
         votes = []
         for robot in robots:
             votes.append(robot.getVotes(robots=robots, jobs=jobs,
-                         tick=ticks, numVotes=3, honest=honest))
+                         tick=ticks, numVotes=self.numVotes, honest=honest))
         results = self.resolveVotes(votes, len(robots), len(jobs))
         winners = [-1 for i in range(len(jobs))]
         for i in range(len(jobs)):
@@ -72,7 +79,8 @@ class WarehouseManager:
 
     def resolveVotes(self, votes, numRobots, numJobs):
         results = [[0 for _ in range(numRobots)] for _ in range(numJobs)]
-        scheme = [2, 1, 0]
+        # First preference is worth numVotes - 1 points, last preference is worth nothing
+        scheme = [self.numVotes - 1 - pos for pos in range(self.numVotes)]
         for voter in votes:
             for jobVote in voter.jobVotes:
                 for pos, robot in enumerate(jobVote["vote"]):
@@ -92,18 +100,12 @@ class WarehouseManager:
             for i in range(len(jobs) - len(robots)):
                 utilities.append([MIN_UTIL for _ in range(len(jobs))])
 
-        # Generates all Possible Permutations of Assignments
-        perms = permutations(
-            [i for i in range(max(len(robots), len(jobs)))], len(jobs))
-
-        # Finds the Permutation which Optimizes total Utility
-
-        bestAssignment = max(perms, key=lambda x: sum(
-            [utilities[j][i] for i, j in enumerate(x)]))
+        # Finds the Assignment which Optimizes total Utility
+        bestAssignment = maximizeUtility(utilities, len(jobs))
 
         # Assigns Based on Results
         for job, robot in enumerate(bestAssignment):
-            if robot >= len(robots):
+            if robot < 0 or robot >= len(robots):
                 continue
             self.assignJobToRobot(robots[robot], jobs[job])
 
@@ -135,7 +137,6 @@ class WarehouseManager:
         jobsInVoting = []
         for job in jobList:
             if totalTicks >= job.activationTime and not job.assigned:
-                robotsInRange = self.robotsInRangeOfStation(robots, job)
                 jobsInVoting.append(job)
         if len(jobsInVoting) > 0:
             if (self.mode == 'b'):
@@ -209,29 +210,24 @@ class WarehouseManager:
             job.assigned = True
 
     def getRobotVotes(self, jobList, robots, isRanked):
-        robotVotes = []
-        robotBorda = []
-        for robot in robots:
-            robotVotes.append([robot, robot.getRobotRankedVotes(jobList)])
-            robotBorda.append([robot, robot.getBordaStyleVotes(jobList)])
+        # Every robot's votes come out of one robots x jobs distance matrix, one column per job
+        distances = distanceMatrix(robots, jobList)
+        if isRanked:
+            votes = rankedVotes(distances, np.array([robot.batteryPercent for robot in robots])).T.tolist()
+        else:
+            votes = bordaVotes(distances).T.tolist()
         for i, job in enumerate(jobList):
             winner = []
             winningVal = 0
-            realVotes = []
-            if isRanked:
-                realVotes = robotVotes
-            else:
-                realVotes = robotBorda
-            for robot in realVotes:
-                val = robot[1][i]
+            for robot, val in zip(robots, votes[i]):
                 if (val > winningVal):
-                    winner.append(robot[0])
+                    winner.append(robot)
                     winningVal = val
                 elif val == winningVal:
-                    winner.append(robot[0])
+                    winner.append(robot)
             if len(winner) == 1:
                 self.assignJobToRobot(winner[0], job)
-            else:
+            elif len(winner) > 1:
                 self.assignJobToRobot(self.findOptimalRobot(winner, job), job)
 
     def getFairRobot(self, robots, job):
@@ -1,36 +1,56 @@
 import random
-import pygame
 import constants
 import argparse
-from pygame.locals import *
+from contextlib import nullcontext
 from robot import Robot
+from vectorEngine import VectorEngine, VectorRobot
+from distanceField import DistanceField
+from distanceCache import DistanceCache
+from pathEngine import PathEngine
+from landmarkEngine import LandmarkEngine
+from breadthFirstEngine import BreadthFirstEngine
+from jumpPointEngine import JumpPointEngine
+from mapCache import MapCache
+from reservationTable import ReservationTable
+from routeLibrary import RouteLibrary
+from spatialIndex import SpatialIndex
+from warehouseGrid import WarehouseGrid
 from jobStation import JobStation
-from drawManager import DrawManager
 from warehouseManager import WarehouseManager
-from dataclasses import dataclass
+from jobStore import JobStore
 from statisticManager import StatisticManager
+from profiler import Profiler
+from telemetry import TelemetrySink
+from snapshot import writeSnapshot, readSnapshot
 
 
-@dataclass
-class Job:
-    startX: int
-    startY: int
-    endX: int
-    endY: int
-    activationTime: int
-    assigned: bool
-    fake: bool
+# pygame and the DrawManager are only imported once a simulation with a GUI is made, so headless runs never
+# load them
+pygame = None
+
+
+# Path planners robots can walk with. The ones that ignore cell weights take the path with the fewest steps
+PLANNERS = {
+    'astar': PathEngine,
+    'landmark': LandmarkEngine,
+    'bfs': BreadthFirstEngine,
+    'jps': JumpPointEngine,
+}
+
 
-    def __hash__(self):
-        return hash(self.startX) * 7 + hash(self.startY) * 13 + 7 * hash(self.fake)
 class WarehouseSimulator:
+    # Longest stretch of quiet ticks skipped in one go when no more jobs are coming
+    MAX_SKIP = 100000
 
-    
-    def __init__(self, fps, mode, gui, verbose, iterations, warehouse) -> None:
+    def __init__(self, fps, mode, gui, verbose, iterations, warehouse, numVotes=3, engine='object', fastForward=False,
+                 reservePaths=False, planner='astar', profile=False, profileOutput=None, telemetry=None,
+                 cacheDir=None) -> None:
         self.gui = gui
         self.fps = fps
         self.verbose = verbose
         self.iterations = iterations
+        # Skipping ahead over quiet ticks only makes sense when nobody is watching
+        self.fastForward = fastForward and not gui
         self.cell_size = 15
         self.warehouse = warehouse
         self.num_horizontal_cells = len(self.warehouse[0])
@@ -41,18 +61,55 @@ class WarehouseSimulator:
         self.jobStations = self.getJobStations()
         # List of Charging stations and their coordinates
         self.chargingStations = self.getChargingStations()
+        # One read-only grid and path engine shared by all the robots, along with the path lengths to every
+        # charging and job station and a cache for the lengths between any other cells
+        self.grid = WarehouseGrid(self.warehouse)
+        self.pathEngine = PLANNERS[planner](self.grid)
+        # Distance fields and routes can be kept on disk between runs, keyed by the warehouse layout
+        self.planner = planner
+        self.mapCache = MapCache(cacheDir) if cacheDir else None
+        # Robots plan through the route library, which shares one copy of each route between two stations
+        self.routes = RouteLibrary(self.pathEngine)
+        if self.mapCache:
+            self.mapCache.loadRoutes(self.routes, planner)
+        self.distanceField = self.mapCache.distanceField(self.grid) if self.mapCache else DistanceField(self.grid)
+        # Path lengths always follow the cell weights, whichever planner the robots walk with
+        lengthEngine = self.pathEngine if self.pathEngine.WEIGHTED else PathEngine(self.grid)
+        self.distanceCache = DistanceCache(self.distanceField, lengthEngine)
+        # Robots either update themselves one at a time, or all at once as arrays in the vector engine
+        self.vectorEngine = VectorEngine(self.grid, self.distanceField, self.chargingStations) if engine == 'vector' else None
+        # Robots can reserve the cells along their paths so they never share one, which needs every robot to check
+        # its next step each tick
+        self.reservePaths = reservePaths
+        self.reservations = None
+        if self.reservePaths and (self.vectorEngine or self.fastForward):
+            raise ValueError("Reserved paths only work with the object engine and without fast forwarding")
+        # Where run picks up from, moved on by loading a snapshot
+        self.iteration = 0
+        self.tick = 1
         # Generate a list of jobs to perform
-        self.jobList = self.generateJobList(self.jobStations, 25, 5)
+        self.jobStore = self.generateJobs(self.jobStations, 25, 5)
         # Create a Stats Object
         self.stats = StatisticManager(len(self.chargingStations))
+        # Per-phase timing, only when asked for since it slows every robot update down a little
+        self.profiler = Profiler(self.pathEngine, profileOutput) if profile or profileOutput else None
+        # Per-tick robot state streamed to .npy files in the telemetry directory
+        self.telemetry = TelemetrySink(telemetry, len(self.chargingStations)) if telemetry else None
+        # Robots keep a spatial index of where they are for neighbour and in range lookups. Robots that can't reach
+        # each other would count as no distance apart, which the index can't find without checking every robot
+        self.indexRobots = self.grid.connects((station[1], station[0]) for station in self.chargingStations)
+        self.spatialIndex = None
+        self.warehouseManager = WarehouseManager(mode, self.verbose, numVotes)
         # Get a list of the robots in the simulation
         self.robots = self.getRobots()
         if self.gui:
+            global pygame
+            import pygame
+            from drawManager import DrawManager
             self.clock = pygame.time.Clock()
             self.screen = pygame.display.set_mode((self.window_width, self.window_height))
             # self.font = pygame.font.Font('freesansbold.ttf', 18)
             self.drawManager = DrawManager(self.screen, self.window_width, self.window_height, self.cell_size, self.warehouse)
-        self.warehouseManager = WarehouseManager(mode, self.verbose)
 
 
 
@@ -62,8 +119,8 @@ class WarehouseSimulator:
         return cellPosX, cellPosY
 
 
-    def generateJobList(self, jobStations, totalJobs, numJobsAssignedAtATime):
-        jobList = []
+    def generateJobs(self, jobStations, totalJobs, numJobsAssignedAtATime):
+        jobStore = JobStore()
         activationTime = 1
         for i in range(totalJobs):
             start = random.choice(jobStations)
@@ -74,10 +131,9 @@ class WarehouseSimulator:
             # Make it so 'x' jobs get assigned at a time
             if i > 0 and i % numJobsAssignedAtATime == 0:
                 activationTime += 30
-            jobList.append(Job(start.location[0], start.location[1],
-                        end.location[0], end.location[1], activationTime, False, False))
+            jobStore.add(start.location[0], start.location[1], end.location[0], end.location[1], activationTime)
 
-        return jobList
+        return jobStore
 
 
     def getJobStations(self):
@@ -102,7 +158,26 @@ class WarehouseSimulator:
 
 
     def getRobots(self):
-        return [Robot(self.chargingStations[i], self.warehouse, self.jobList, self.stats.get(i), i, self.verbose) for i in range(len(self.chargingStations))]
+        if self.reservePaths:
+            self.reservations = ReservationTable(self.grid)
+        if self.indexRobots:
+            self.spatialIndex = SpatialIndex(self.grid.width, self.grid.height)
+            self.warehouseManager.spatialIndex = self.spatialIndex
+        if self.vectorEngine:
+            self.vectorEngine.reset()
+            self.vectorEngine.spatialIndex = self.spatialIndex
+            self.vectorEngine.robots = [VectorRobot(self.vectorEngine, i, self.chargingStations[i], self.routes, self.distanceCache, self.jobStore, self.stats.get(i), i, self.verbose, None, self.spatialIndex) for i in range(len(self.chargingStations))]
+            robots = self.vectorEngine.robots
+        else:
+            robots = [Robot(self.chargingStations[i], self.routes, self.distanceCache, self.jobStore, self.stats.get(i), i, self.verbose, self.reservations, self.spatialIndex) for i in range(len(self.chargingStations))]
+        if self.profiler:
+            self.profiler.instrument(robots)
+        return robots
+
+
+    def phase(self, name):
+        """Times the with block as part of the named phase when profiling"""
+        return self.profiler.phase(name) if self.profiler else nullcontext()
 
         
     def update(self, totalTicks):
@@ -112,38 +187,113 @@ class WarehouseSimulator:
                     return False
         
 
-        self.warehouseManager.update(self.robots, self.jobList, totalTicks)
+        if self.reservations:
+            self.reservations.tick = totalTicks
+        with self.phase("manager"):
+            self.warehouseManager.update(self.robots, self.jobStore, totalTicks)
 
         # There is a chance that all the jobs have been completed before the next round of jobs get assigned.
         # Make sure the simulation keeps running until all jobs have been assigned
-        keepGoing = self.jobList[-1].activationTime > totalTicks
+        keepGoing = self.jobStore.hasPending()
 
         # Update each robot and determine if all jobs have been completed
-        for robot in self.robots:
-            performingJob = robot.update()
-            if performingJob:
-                keepGoing = True
+        with self.phase("robots"):
+            if self.vectorEngine:
+                if self.vectorEngine.update():
+                    keepGoing = True
+            else:
+                for robot in self.robots:
+                    performingJob = robot.update()
+                    if performingJob:
+                        keepGoing = True
         if self.gui:
-            self.drawManager.update(self.robots)
-            pygame.display.update()
+            with self.phase("draw"):
+                pygame.display.update(self.drawManager.update(self.robots))
             self.clock.tick(self.fps)
         return keepGoing
 
 
-    def run(self):
+    def skipQuietTicks(self, nextTick):
+        """
+            Jumps over the ticks starting at nextTick in which nothing but batteries and positions would change: no
+            jobs are waiting or activating, and no robot has to decide anything. Returns the number of ticks skipped
+        """
+        if self.jobStore.getAvailable(nextTick - 1):
+            return 0
+        nextActivation = self.jobStore.getNextActivationTime()
+        limit = nextActivation - nextTick if nextActivation is not None else self.MAX_SKIP
+        for robot in self.robots:
+            limit = robot.fastForward(limit, apply=False)
+            if limit == 0:
+                return 0
+        for robot in self.robots:
+            robot.fastForward(limit)
+        return limit
+
+
+    def saveSnapshot(self, path):
+        """Saves the state of the simulation before self.tick to path, see snapshot.writeSnapshot"""
+        writeSnapshot(self, path)
+
+
+    def loadSnapshot(self, path):
+        """Carries on from a snapshot saved by saveSnapshot the next time run is called"""
+        readSnapshot(self, path)
+
+
+    def run(self, report=True, maxTicks=None, snapshotTick=None, snapshotPath=None):
+        """
+            Runs the simulation for the set number of iterations. With maxTicks set, an iteration that hasn't
+            finished by then is cut short, e.g. on maps where a job needs more battery than a robot can hold.
+            With snapshotTick and snapshotPath set, the state of the first iteration to reach snapshotTick is saved
+            before that tick runs
+        """
         if self.gui:
             pygame.init()
             pygame.display.set_caption('Warehouse Sim')
 
-        for i in range(self.iterations):
+        if self.profiler:
+            self.profiler.start()
+        for i in range(self.iteration, self.iterations):
 
-            totalTicks = 1
+            self.iteration = i
+            totalTicks = self.tick
             keepGoing = True
-            while keepGoing:   
+            while keepGoing and (maxTicks is None or totalTicks <= maxTicks):
+                if snapshotPath and snapshotTick is not None and totalTicks >= snapshotTick:
+                    # Fast forwarding can jump over the tick asked for, so the snapshot is taken just after it
+                    self.tick = totalTicks
+                    self.saveSnapshot(snapshotPath)
+                    snapshotPath = None
                 keepGoing = self.update(totalTicks)
+                if self.telemetry:
+                    self.telemetry.record(totalTicks, i, self.robots, self.jobStore, self.stats, self.vectorEngine)
                 totalTicks += 1
+                if keepGoing and self.fastForward:
+                    with self.phase("fastForward"):
+                        totalTicks += self.skipQuietTicks(totalTicks)
+                if self.profiler:
+                    self.profiler.endTick()
 
+            if self.vectorEngine:
+                self.vectorEngine.flushStats()
+            self.finished = not keepGoing
             self.stats.ticks = totalTicks
-            self.stats.printReport()
-            self.jobList = self.generateJobList(self.jobStations, 17, 5)
-            self.robots = self.getRobots()
\ No newline at end of file
+            if report:
+                self.stats.printReport()
+            if report and self.verbose:
+                self.distanceCache.printReport()
+                self.pathEngine.printReport()
+                self.routes.printReport()
+            self.jobStore = self.generateJobs(self.jobStations, 17, 5)
+            self.robots = self.getRobots()
+            self.tick = 1
+        self.iteration = 0
+        if self.mapCache:
+            self.mapCache.saveRoutes(self.routes, self.planner)
+        if self.telemetry:
+            self.telemetry.flush()
+        if self.profiler:
+            self.profiler.stop()
+            if report:
+                self.profiler.printReport()
\ No newline at end of file